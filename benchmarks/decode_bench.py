@@ -0,0 +1,59 @@
+"""
+Parse cost of an API response: the former str path versus the bytes
+path with each installed JSON decoder.
+
+    python -m benchmarks.decode_bench [--count N] [--emails N]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from websitecontacts.client import Client
+from websitecontacts.decoder import get_decoder
+
+from .stub_server import build_payload
+
+
+def str_path(raw: bytes):
+    # What Client.get did before: decode bytes to str, then parse it.
+    return Client._parse_response(raw.decode('UTF-8'), json.loads)
+
+
+def bytes_path(decoder):
+    return lambda raw: Client._parse_response(raw, decoder)
+
+
+def measure(name: str, func, raw: bytes, count: int):
+    started = time.perf_counter()
+    for _ in range(count):
+        func(raw)
+    elapsed = (time.perf_counter() - started) / count
+
+    tracemalloc.start()
+    func(raw)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print('{:<14} {:9.2f} us  peak {:9d} B'.format(name, elapsed * 1e6, peak))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--emails', type=int, default=50)
+    args = parser.parse_args()
+
+    raw = build_payload(args.emails)
+    print('payload {} bytes'.format(len(raw)))
+    measure('str+json', str_path, raw, args.count)
+    for name in ('json', 'ujson', 'orjson'):
+        try:
+            decoder = get_decoder(name)
+        except ValueError:
+            continue
+        measure('bytes+' + name, bytes_path(decoder), raw, args.count)
+
+
+if __name__ == '__main__':
+    main()
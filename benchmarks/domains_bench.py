@@ -0,0 +1,65 @@
+"""
+Domain validation: the former `Client._re_domain_name` regex versus the
+single pass scanner, plus full normalization of a mixed input list.
+
+    python -m benchmarks.domains_bench [--count N]
+"""
+import argparse
+import random
+import re
+import time
+
+from websitecontacts.domains import is_valid_domain, normalize_domains
+
+# What Client._validate_domain_name matched before.
+_re_domain_name = re.compile(
+    r'^(?:[0-9a-z_](?:[0-9a-z-_]{0,62}(?<=[0-9a-z-_])[0-9a-z_])?\.)+'
+    + r'[0-9a-z][0-9a-z-]{0,62}[a-z0-9]$', re.IGNORECASE)
+
+
+def make_domains(count: int, seed: int = 1):
+    rnd = random.Random(seed)
+    alphabet = 'abcdefghijklmnopqrstuvwxyz0123456789-'
+    domains = []
+    for _ in range(count):
+        labels = [
+            rnd.choice('abcdefghij') + ''.join(
+                rnd.choice(alphabet) for _ in range(rnd.randint(2, 20)))
+            + rnd.choice('klmnopqrst')
+            for _ in range(rnd.randint(1, 3))]
+        domains.append('.'.join(labels) + '.' + rnd.choice(
+            ['com', 'org', 'net', 'io', 'co.uk']))
+    # A long, almost valid label is the worst case for the regex.
+    domains.extend(['a' + 'b-' * 31 + '.c-'] * (count // 100))
+    return domains
+
+
+def measure(name: str, func, values):
+    started = time.perf_counter()
+    for value in values:
+        func(value)
+    elapsed = time.perf_counter() - started
+    print('{:<14} {:6.3f} us/domain  {:10.0f} domains/s'.format(
+        name, elapsed / len(values) * 1e6, len(values) / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200000)
+    args = parser.parse_args()
+
+    domains = make_domains(args.count)
+    measure('regex', _re_domain_name.search, domains)
+    measure('scanner', is_valid_domain, domains)
+
+    urls = ['https://www.{}/index.html'.format(d.upper()) for d in domains]
+    for name, values in (('normalize', domains), ('normalize url', urls)):
+        started = time.perf_counter()
+        valid, invalid = normalize_domains(values)
+        elapsed = time.perf_counter() - started
+        print('{:<14} {:6.3f} us/domain  {} valid, {} invalid'.format(
+            name, elapsed / len(values) * 1e6, len(valid), len(invalid)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Cold import cost, measured with `python -X importtime` in fresh
+interpreters.
+
+    python -m benchmarks.import_bench [--runs N] [--top N]
+"""
+import argparse
+import subprocess
+import sys
+
+API_KEY = 'at_' + '0' * 29
+
+SCENARIOS = {
+    'import_package': 'import websitecontacts',
+    'import_client': 'from websitecontacts import Client',
+    'create_client': 'from websitecontacts import Client; '
+                     'Client({!r})'.format(API_KEY),
+}
+
+
+def import_times(statement: str) -> dict:
+    """
+    Run `statement` in a new interpreter and return the cumulative import
+    time in microseconds of each top-level module it imported.
+    """
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(statement: str, runs: int) -> list:
+    """
+    :return: import times in seconds of `statement`, without the modules
+        the interpreter imports on its own
+    """
+    startup = set(import_times('pass'))
+    timings = []
+    for _ in range(runs):
+        times = import_times(statement)
+        timings.append(sum(
+            t for name, t in times.items() if name not in startup) / 1e6)
+    return timings
+
+
+def slowest_modules(statement: str, top: int) -> list:
+    startup = set(import_times('pass'))
+    times = import_times(statement)
+    return sorted(((t, name) for name, t in times.items()
+                   if name not in startup), reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--top', type=int, default=5,
+                        help='slowest top-level imports shown per scenario')
+    args = parser.parse_args()
+
+    for name, statement in SCENARIOS.items():
+        timings = sorted(measure(statement, args.runs))
+        print('{:<16} median {:8.2f} ms  min {:8.2f} ms'.format(
+            name, timings[len(timings) // 2] * 1e3, timings[0] * 1e3))
+        for cumulative, module in slowest_modules(statement, args.top):
+            print('    {:<40} {:8.2f} ms'.format(module, cumulative / 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Construction time and per-object memory of response models.
+
+    python -m benchmarks.models_bench [--count N]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from websitecontacts import Response
+
+from .stub_server import SAMPLE_RESPONSE
+
+
+def construction_time(payload: dict, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        Response(payload)
+    return (time.perf_counter() - started) / count
+
+
+def access_time(payload: dict, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        response = Response(payload)
+        response.emails
+        response.phones
+    return (time.perf_counter() - started) / count
+
+
+def memory_per_object(payload: dict, count: int) -> float:
+    # Every object gets its own decoded payload, like responses
+    # coming from separate API calls do.
+    raw = json.dumps(payload)
+    payloads = [json.loads(raw) for _ in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [Response(p) for p in payloads]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    print('construction        {:8.2f} us'.format(
+        construction_time(SAMPLE_RESPONSE, args.count) * 1e6))
+    print('construction+access {:8.2f} us'.format(
+        access_time(SAMPLE_RESPONSE, args.count) * 1e6))
+    print('memory per object   {:8.0f} B'.format(
+        memory_per_object(SAMPLE_RESPONSE, args.count // 10)))
+
+
+if __name__ == '__main__':
+    main()
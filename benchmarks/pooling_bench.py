@@ -0,0 +1,51 @@
+"""
+Per-call latency of pooled vs unpooled requesters against a local
+HTTPS stub.
+
+    python -m benchmarks.pooling_bench [--calls N]
+"""
+import argparse
+import os
+import statistics
+import time
+
+from websitecontacts import Client
+
+from .stub_server import API_KEY, StubServer
+
+
+def measure(url: str, pooled: bool, calls: int) -> list:
+    client = Client(API_KEY, base_url=url, pooled=pooled)
+    timings = []
+    try:
+        for _ in range(calls):
+            started = time.perf_counter()
+            client.get_raw('youtube.com')
+            timings.append(time.perf_counter() - started)
+    finally:
+        client.close()
+    return timings
+
+
+def report(name: str, timings: list):
+    ordered = sorted(timings)
+    print('{:<10} mean {:7.3f} ms  p50 {:7.3f} ms  p99 {:7.3f} ms'.format(
+        name,
+        statistics.mean(ordered) * 1000,
+        ordered[len(ordered) // 2] * 1000,
+        ordered[int(len(ordered) * 0.99) - 1] * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=200)
+    args = parser.parse_args()
+
+    with StubServer(tls=True) as server:
+        os.environ['REQUESTS_CA_BUNDLE'] = server.ca_file
+        report('unpooled', measure(server.url, False, args.calls))
+        report('pooled', measure(server.url, True, args.calls))
+
+
+if __name__ == '__main__':
+    main()
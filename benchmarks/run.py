@@ -0,0 +1,152 @@
+"""
+Benchmark suite: throughput and latency percentiles of the hot paths,
+saved as JSON so runs of different releases can be compared.
+
+    python -m benchmarks.run [--output results.json] [--compare old.json]
+
+Client scenarios run against the local stub server, whose latency,
+payload size and error rate are configurable. Import scenarios measure
+cold start with `python -X importtime` in fresh interpreters.
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+
+from websitecontacts import Client, Response, ResponseError
+from websitecontacts.version import VERSION
+
+from . import import_bench
+from .stub_server import API_KEY, ERROR_RESPONSE, StubServer, build_payload
+
+
+def timed(func, count: int) -> dict:
+    timings = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(count):
+        call_started = time.perf_counter()
+        try:
+            func()
+        except Exception:
+            errors += 1
+        timings.append(time.perf_counter() - call_started)
+    total = time.perf_counter() - started
+    return summarize(timings, total, errors)
+
+
+def summarize(timings: list, total: float, errors: int) -> dict:
+    ordered = sorted(timings)
+    return {
+        'count': len(ordered),
+        'errors': errors,
+        'throughput_per_s': len(ordered) / total if total else 0.0,
+        'mean_us': sum(ordered) / len(ordered) * 1e6,
+        'p50_us': percentile(ordered, 0.50) * 1e6,
+        'p99_us': percentile(ordered, 0.99) * 1e6,
+    }
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    rank = int(round(fraction * len(ordered)))
+    index = min(len(ordered) - 1, max(0, rank - 1))
+    return ordered[index]
+
+
+def run(args) -> dict:
+    payload = json.loads(build_payload(args.emails))
+    error_body = json.dumps(ERROR_RESPONSE)
+    results = {
+        'response_init': timed(lambda: Response(payload), args.count * 10),
+        'response_error_init': timed(
+            lambda: ResponseError(error_body), args.count * 10),
+    }
+
+    with StubServer(latency=args.latency, emails=args.emails,
+                    error_rate=args.error_rate) as server:
+        client = Client(API_KEY, base_url=server.url, pooled=True)
+        try:
+            results['client_get'] = timed(
+                lambda: client.get('youtube.com'), args.count)
+            results['client_get_raw'] = timed(
+                lambda: client.get_raw('youtube.com'), args.count)
+        finally:
+            client.close()
+
+    for name, statement in import_bench.SCENARIOS.items():
+        timings = import_bench.measure(statement, args.import_runs)
+        results[name] = summarize(timings, sum(timings), 0)
+
+    return {
+        'version': VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': datetime.datetime.now(
+            datetime.timezone.utc).isoformat(),
+        'config': {
+            'count': args.count,
+            'latency': args.latency,
+            'emails': args.emails,
+            'error_rate': args.error_rate,
+            'import_runs': args.import_runs,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """Print relative changes; return False on a p50 regression."""
+    ok = True
+    for name, result in sorted(current['results'].items()):
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        change = result['p50_us'] / old['p50_us'] - 1
+        regressed = change > threshold
+        ok = ok and not regressed
+        print('{:<22} p50 {:10.2f} us -> {:10.2f} us ({:+.1%}){}'.format(
+            name, old['p50_us'], result['p50_us'], change,
+            '  REGRESSION' if regressed else ''))
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1000,
+                        help='calls per client scenario')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='stub server latency in seconds')
+    parser.add_argument('--emails', type=int, default=0,
+                        help='extra emails in each response')
+    parser.add_argument('--error-rate', type=float, default=0,
+                        help='fraction of 503 answers')
+    parser.add_argument('--import-runs', type=int, default=10,
+                        help='fresh interpreters per import time scenario')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON results')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed relative p50 slowdown')
+    args = parser.parse_args()
+
+    report = run(args)
+    for name, result in sorted(report['results'].items()):
+        print('{:<22} {:10.0f}/s  p50 {:10.2f} us  p99 {:10.2f} us  '
+              'errors {}'.format(name, result['throughput_per_s'],
+                                 result['p50_us'], result['p99_us'],
+                                 result['errors']))
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+        if not compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Local stub of the Website Contacts API endpoint used by the benchmarks.
+
+The server speaks HTTP/1.1 with keep-alive, so pooled and unpooled
+requesters can be compared against it. With ``tls=True`` it serves HTTPS
+using a throwaway self-signed certificate for ``localhost`` generated
+with the ``openssl`` binary.
+
+Every answer can be delayed (``latency``), padded with extra emails
+(``emails``) and, with probability ``error_rate``, replaced by a 503.
+"""
+import json
+import os
+import random
+import shutil
+import time
+import ssl
+import subprocess
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    # http.server.ThreadingHTTPServer needs Python 3.7.
+    daemon_threads = True
+
+
+API_KEY = 'at_' + '0' * 29
+
+SAMPLE_RESPONSE = {
+    "companyNames": ["Google LLC D/B/A YouTube", "Google Inc"],
+    "countryCode": "US",
+    "domainName": "youtube.com",
+    "emails": [
+        {"description": "Press", "email": "press@google.com"},
+        {"description": "Support", "email": "support@google.com"},
+    ],
+    "meta": {"description": "Enjoy the videos and music you love.",
+             "title": "YouTube"},
+    "phones": [
+        {"callHours": "", "description": "", "phoneNumber": "650-253-0001"},
+    ],
+    "postalAddresses": ["901 Cherry Ave. San Bruno CA 94066 USA"],
+    "socialLinks": {"facebook": "https://www.facebook.com/youtube/",
+                    "instagram": "https://www.instagram.com/youtube/",
+                    "linkedIn": "",
+                    "twitter": "https://twitter.com/YouTube"},
+    "websiteResponded": True,
+}
+
+
+ERROR_RESPONSE = {"code": 503, "messages": "Service unavailable"}
+
+
+def build_payload(emails: int = 0) -> bytes:
+    """Sample response body with `emails` extra email entries."""
+    body = dict(SAMPLE_RESPONSE)
+    body['emails'] = SAMPLE_RESPONSE['emails'] + [
+        {'description': 'Contact {}'.format(i),
+         'email': 'contact{}@example.com'.format(i)}
+        for i in range(emails)]
+    return json.dumps(body).encode('utf-8')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.error_rate and server.random.random() < server.error_rate:
+            status, body = 503, json.dumps(ERROR_RESPONSE).encode('utf-8')
+        else:
+            status, body = 200, server.payload
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer:
+    def __init__(self, tls: bool = False, handler=StubHandler,
+                 latency: float = 0, emails: int = 0,
+                 error_rate: float = 0, seed: int = 0):
+        self._tls = tls
+        self._tmpdir = None
+        self.ca_file = None
+        self._server = ThreadingHTTPServer(('localhost', 0), handler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.payload = build_payload(emails)
+        self._server.error_rate = error_rate
+        self._server.random = random.Random(seed)
+        if tls:
+            self._wrap_tls()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        scheme = 'https' if self._tls else 'http'
+        return '{}://localhost:{}/api/v1'.format(
+            scheme, self._server.server_address[1])
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._tmpdir:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def _wrap_tls(self):
+        self._tmpdir = tempfile.mkdtemp()
+        cert = os.path.join(self._tmpdir, 'cert.pem')
+        key = os.path.join(self._tmpdir, 'key.pem')
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+             '-keyout', key, '-out', cert, '-days', '1',
+             '-subj', '/CN=localhost',
+             '-addext', 'subjectAltName=DNS:localhost'],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        self._server.socket = context.wrap_socket(
+            self._server.socket, server_side=True)
+        self.ca_file = cert
@@ -0,0 +1,79 @@
+"""
+Speed and peak memory of building a `Response` from XML with the
+incremental parser, compared with the JSON path and a full DOM parse.
+
+    python -m benchmarks.xml_bench [--count N] [--emails N]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from xml.etree.ElementTree import fromstring
+from xml.sax.saxutils import escape
+
+from websitecontacts import Response
+from websitecontacts.models.xml_parser import parse_xml
+
+from .stub_server import build_payload
+
+_ITEM_TAGS = {'companyNames': 'companyName', 'emails': 'email',
+              'phones': 'phone', 'postalAddresses': 'postalAddress'}
+
+
+def to_xml(value, tag: str) -> str:
+    if isinstance(value, dict):
+        inner = ''.join(to_xml(v, k) for k, v in value.items())
+    elif isinstance(value, list):
+        inner = ''.join(to_xml(v, _ITEM_TAGS[tag]) for v in value)
+    elif isinstance(value, bool):
+        inner = 'true' if value else 'false'
+    else:
+        inner = escape(str(value))
+    return '<{0}>{1}</{0}>'.format(tag, inner)
+
+
+def json_path(raw: bytes):
+    return Response(json.loads(raw))
+
+
+def xml_path(raw: bytes):
+    return Response(parse_xml(raw))
+
+
+def dom_path(raw: bytes):
+    # Full tree for comparison; not a complete conversion.
+    return fromstring(raw)
+
+
+def measure(name: str, func, raw: bytes, count: int):
+    started = time.perf_counter()
+    for _ in range(count):
+        func(raw)
+    elapsed = (time.perf_counter() - started) / count
+
+    tracemalloc.start()
+    func(raw)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print('{:<6} {:7d} B  {:10.2f} us  peak {:9d} B'.format(
+        name, len(raw), elapsed * 1e6, peak))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--emails', type=int, default=50)
+    args = parser.parse_args()
+
+    raw_json = build_payload(args.emails)
+    raw_xml = ('<?xml version="1.0" encoding="utf-8"?>' + to_xml(
+        json.loads(raw_json), 'websiteContacts')).encode('utf-8')
+
+    measure('json', json_path, raw_json, args.count)
+    measure('xml', xml_path, raw_xml, args.count)
+    measure('dom', dom_path, raw_xml, args.count)
+
+
+if __name__ == '__main__':
+    main()
@@ -66,10 +66,27 @@ setup(
         'whois',
         'whoisxmlapi',
     ],
+    entry_points={
+        'console_scripts': [
+            'websitecontacts = websitecontacts.cli:main',
+        ],
+    },
     install_requires=[
         'requests',
     ],
     extras_require={
+        'async': [
+            'aiohttp',
+        ],
+        'fast': [
+            'orjson',
+        ],
+        'arrow': [
+            'pyarrow',
+        ],
+        'compression': [
+            'brotli',
+        ],
         'dev': [
             'tox',
             'flake8',
@@ -1,11 +1,44 @@
 __all__ = ['Client', 'ErrorMessage', 'WebsiteContactsApiError', 'ApiAuthError',
            'HttpApiError', 'EmptyApiKeyError', 'ParameterError',
            'ResponseError', 'BadRequestError', 'UnparsableApiResponseError',
-           'ApiRequester', 'Response', 'Email', 'Phone']
-
-from .client import Client
-from .net.http import ApiRequester
-from .models.response import ErrorMessage, Response, Email, Phone
-from .exceptions.error import WebsiteContactsApiError, ParameterError, \
-    EmptyApiKeyError, ResponseError, UnparsableApiResponseError, \
-    ApiAuthError, BadRequestError, HttpApiError
+           'ApiRequester', 'Response', 'Email', 'Phone', 'AsyncClient',
+           'AsyncApiRequester', 'stream', 'RetryPolicy', 'ResponseBatch',
+           'Instrumentation', 'normalize_domain', 'normalize_domains',
+           'KeyPool', 'ResponseTooLargeError', 'RefreshScheduler',
+           'HedgePolicy']
+
+from ._lazy import lazy_exports
+
+# Public names are imported from their modules on first access, so
+# `import websitecontacts` doesn't pay for requests, aiohttp or pyarrow.
+_EXPORTS = {
+    'Client': '.client',
+    'AsyncClient': '.async_client',
+    'stream': '.streaming',
+    'normalize_domain': '.domains',
+    'normalize_domains': '.domains',
+    'Instrumentation': '.instrumentation',
+    'KeyPool': '.keys',
+    'RefreshScheduler': '.refresh',
+    'ApiRequester': '.net.http',
+    'AsyncApiRequester': '.net.async_http',
+    'RetryPolicy': '.net.retry',
+    'HedgePolicy': '.net.hedge',
+    'ErrorMessage': '.models.response',
+    'Response': '.models.response',
+    'Email': '.models.response',
+    'Phone': '.models.response',
+    'ResponseBatch': '.models.batch',
+    'WebsiteContactsApiError': '.exceptions.error',
+    'ParameterError': '.exceptions.error',
+    'EmptyApiKeyError': '.exceptions.error',
+    'ResponseError': '.exceptions.error',
+    'UnparsableApiResponseError': '.exceptions.error',
+    'ApiAuthError': '.exceptions.error',
+    'BadRequestError': '.exceptions.error',
+    'HttpApiError': '.exceptions.error',
+    'ResponseTooLargeError': '.exceptions.error',
+}
+
+
+__getattr__, __dir__ = lazy_exports(__name__, __all__, _EXPORTS)
@@ -0,0 +1,36 @@
+import sys
+from importlib import import_module
+
+
+def lazy_exports(package: str, names: list, exports: dict):
+    """
+    Build the module `__getattr__` and `__dir__` of a package whose
+    public names are imported from their modules on first access
+    (PEP 562). Python 3.6 has no module `__getattr__`, so the names are
+    imported right away there.
+
+    :param package: str: Package name, `__name__` of the caller.
+    :param names: list: The package's `__all__`.
+    :param exports: dict: Public name to relative module name.
+    :return: (__getattr__, __dir__) functions
+    """
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name):
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(package, name))
+
+        value = getattr(import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(names))
+
+    if sys.version_info < (3, 7):  # pragma: no cover - no PEP 562
+        for name in names:
+            namespace[name] = __getattr__(name)
+
+    return __getattr__, __dir__
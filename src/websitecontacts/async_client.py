@@ -0,0 +1,259 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+from .client import Client
+from .decoder import get_decoder
+from .models.response import Response
+from .models.xml_parser import parse_xml
+from .singleflight import AsyncSingleFlight
+from .keys import KeyPool
+from .exceptions.error import EmptyApiKeyError, ApiAuthError
+
+if TYPE_CHECKING:
+    from .net.async_http import AsyncApiRequester
+
+
+class AsyncClient:
+    __default_url = "https://website-contacts.whoisxmlapi.com/api/v1"
+    _api_requester: 'AsyncApiRequester or None'
+    _api_key: str
+    _last_result: Response or None
+
+    JSON_FORMAT = Client.JSON_FORMAT
+    XML_FORMAT = Client.XML_FORMAT
+
+    def __init__(self, api_key: str or list or KeyPool, **kwargs):
+        """
+        :param api_key: str: Your API key, a list of keys or a `KeyPool`.
+            See `Client`.
+        :key key_strategy: str: (optional) KeyPool.ROUND_ROBIN (default)
+            or KeyPool.LEAST_LOADED, used when api_key is a list
+        :key base_url: str: (optional) API endpoint URL.
+        :key timeout: float: (optional) API call timeout in seconds
+        :key pool_size: int: (optional) max number of keep-alive connections
+        :key max_concurrency: int: (optional) max number of requests
+            in flight
+        :key coalesce: bool: (optional) share one API call between
+            concurrent identical lookups, True by default
+        :key json_decoder: str or callable: (optional) 'json', 'orjson',
+            'ujson' or a function decoding bytes, the fastest installed
+            decoder by default
+        """
+
+        self._api_key = ''
+        self._key_pool = None
+        self._last_result = None
+
+        self._key_strategy = kwargs.pop('key_strategy', KeyPool.ROUND_ROBIN)
+        self.api_key = api_key
+        self._inflight = AsyncSingleFlight() \
+            if kwargs.pop('coalesce', True) else None
+        self._decoder = get_decoder(kwargs.pop('json_decoder', None))
+
+        if 'base_url' not in kwargs:
+            kwargs['base_url'] = AsyncClient.__default_url
+
+        from .net.async_http import AsyncApiRequester
+        self.api_requester = AsyncApiRequester(**kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def api_key(self) -> str:
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, value: str or list or KeyPool):
+        self._key_pool = Client._validate_key_pool(value, self._key_strategy)
+        if self._key_pool is None:
+            self._api_key = Client._validate_api_key(value)
+        else:
+            self._api_key = self._key_pool.keys[0]
+
+    @property
+    def key_pool(self) -> KeyPool or None:
+        return self._key_pool
+
+    @property
+    def key_usage(self) -> dict:
+        """Per-key counters when several API keys are used"""
+        if self._key_pool is None:
+            return {}
+        return self._key_pool.stats()
+
+    @property
+    def api_requester(self) -> 'AsyncApiRequester or None':
+        return self._api_requester
+
+    @api_requester.setter
+    def api_requester(self, value: 'AsyncApiRequester'):
+        self._api_requester = value
+
+    @property
+    def base_url(self) -> str:
+        return self._api_requester.base_url
+
+    @base_url.setter
+    def base_url(self, value: str or None):
+        if value is None:
+            self._api_requester.base_url = AsyncClient.__default_url
+        else:
+            self._api_requester.base_url = value
+
+    @property
+    def collapsed_requests(self) -> int:
+        """Number of lookups that shared a concurrent identical API call"""
+        if self._inflight is None:
+            return 0
+        return self._inflight.collapsed
+
+    @property
+    def last_result(self) -> Response or None:
+        return self._last_result
+
+    @property
+    def timeout(self) -> float:
+        return self._api_requester.timeout
+
+    @timeout.setter
+    def timeout(self, value: float):
+        self._api_requester.timeout = value
+
+    async def close(self):
+        """Close pooled connections held by the API requester."""
+        await self._api_requester.close()
+
+    async def get(self, domain: str, hard_refresh: bool = False,
+                  output_format: str = Client._PARSABLE_FORMAT) -> Response:
+        """
+        Get parsed API response as a `Response` instance.
+
+        :key domain: Required. The website's domain name.
+        :key hard_refresh: Optional. Boolean.
+            False (Default) for getting the cached contacts information
+            if there is one.
+            True for demanding the website contacts information from scratch.
+        :key output_format: Optional. Format requested from the API.
+            Use AsyncClient.JSON_FORMAT (Default) and AsyncClient.XML_FORMAT
+            constants
+        :return: `Response` instance
+        :raises aiohttp.ClientError:
+        :raises WebsiteContactsApiError: Base class for all errors below
+        :raises ResponseError: response contains an error message
+        :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
+        :raises BadRequestError: Server returned 400 or 422 HTTP code
+        :raises HttpApiError: HTTP code >= 300 and not equal to above codes
+        :raises ParameterError: invalid parameter's value
+        """
+
+        self._last_result = await self._get_one(
+            domain, hard_refresh, output_format)
+        return self._last_result
+
+    async def get_raw(self, domain: str, hard_refresh: bool = False,
+                      output_format: str = Client._PARSABLE_FORMAT) -> str:
+        """
+        Get raw API response.
+
+        :key domain: Required. The website's domain name.
+        :key hard_refresh: Optional. Boolean.
+            False (Default) for getting the cached contacts information
+            if there is one.
+            True for demanding the website contacts information from scratch.
+        :key output_format: Optional.
+        Use AsyncClient.JSON_FORMAT and AsyncClient.XML_FORMAT
+            constants
+        :return: str
+        :raises aiohttp.ClientError:
+        :raises WebsiteContactsApiError: Base class for all errors below
+        :raises ParameterError: invalid parameter's value
+        """
+
+        return (await self.get_raw_bytes(
+            domain, hard_refresh, output_format)).decode('UTF-8')
+
+    async def get_raw_bytes(self, domain: str, hard_refresh: bool = False,
+                            output_format: str = Client._PARSABLE_FORMAT
+                            ) -> bytes:
+        """
+        Get raw API response bytes without decoding them.
+
+        Accepts the same parameters and raises the same errors
+        as `get_raw`.
+
+        :return: bytes
+        """
+
+        if self.api_key == '':
+            raise EmptyApiKeyError('')
+
+        _domain = Client._validate_domain_name(domain)
+        _hard_refresh = 1 if hard_refresh else 0
+        _output_format = Client._validate_output_format(output_format)
+
+        def fetch():
+            return self._with_key(
+                lambda api_key: self._api_requester.get_bytes(
+                    Client._build_payload(
+                        api_key,
+                        _domain,
+                        _hard_refresh,
+                        _output_format,
+                    )))
+
+        if self._inflight is None:
+            return await fetch()
+        return await self._inflight.do(
+            (_domain, _hard_refresh, _output_format), fetch)
+
+    async def _with_key(self, call):
+        if self._key_pool is None:
+            return await call(self.api_key)
+
+        while True:
+            api_key = self._key_pool.acquire()
+            try:
+                result = await call(api_key)
+            except ApiAuthError as error:
+                self._key_pool.release(api_key, error)
+                self._key_pool.disable(api_key)
+                if not self._key_pool.active_keys:
+                    raise
+                continue
+            except Exception as error:
+                self._key_pool.release(api_key, error)
+                raise
+            self._key_pool.release(api_key)
+            return result
+
+    async def get_many(self, domains, hard_refresh: bool = False) -> list:
+        """
+        Look up several domains concurrently.
+
+        The number of requests in flight is bounded by the requester's
+        `max_concurrency`. Failed lookups don't abort the batch.
+
+        :key domains: Required. Iterable of domain names.
+        :key hard_refresh: Optional. Boolean.
+        :return: list of (domain, `Response` or exception) pairs
+            in input order
+        """
+
+        domains = list(domains)
+        results = await asyncio.gather(
+            *[self._get_one(d, hard_refresh) for d in domains],
+            return_exceptions=True)
+        return list(zip(domains, results))
+
+    async def _get_one(self, domain: str, hard_refresh: bool,
+                       output_format: str = Client._PARSABLE_FORMAT
+                       ) -> Response:
+        response = await self.get_raw_bytes(
+            domain, hard_refresh, output_format)
+        if output_format.lower() == Client.XML_FORMAT:
+            return Client._parse_response(response, parse_xml)
+        return Client._parse_response(response, self._decoder)
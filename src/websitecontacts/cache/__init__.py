@@ -0,0 +1,11 @@
+__all__ = ['BaseCache', 'CacheEntry', 'MemoryCache', 'SqliteCache']
+
+from .._lazy import lazy_exports
+
+# sqlite3 is only loaded when SqliteCache is used.
+__getattr__, __dir__ = lazy_exports(__name__, __all__, {
+    'BaseCache': '.base',
+    'CacheEntry': '.base',
+    'MemoryCache': '.memory',
+    'SqliteCache': '.sqlite',
+})
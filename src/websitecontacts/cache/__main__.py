@@ -0,0 +1,22 @@
+import argparse
+
+from .sqlite import SqliteCache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m websitecontacts.cache',
+        description='Compact a website contacts response cache.')
+    parser.add_argument('path', help='cache database file')
+    parser.add_argument('--ttl', type=float, default=86400,
+                        help='drop entries older than TTL seconds')
+    args = parser.parse_args(argv)
+
+    cache = SqliteCache(args.path, ttl=args.ttl)
+    deleted = cache.compact()
+    print('Removed {} expired entries, {} left'.format(deleted, len(cache)))
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
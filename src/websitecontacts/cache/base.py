@@ -0,0 +1,140 @@
+import threading
+import time
+
+
+class CacheEntry:
+    """
+    Raw API response bytes kept by a cache.
+
+    `response` holds the parsed `Response` once it has been built, so
+    in-memory caches can skip JSON decoding on later hits. `etag` and
+    `last_modified` are the API's validators for conditional requests.
+    """
+
+    def __init__(self, raw: bytes, stored_at: float = None,
+                 etag: str = None, last_modified: str = None):
+        self.raw = raw
+        self.stored_at = time.time() if stored_at is None else stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.response = None
+
+    @property
+    def revalidatable(self) -> bool:
+        """Whether the API can confirm the entry is still current"""
+        return self.etag is not None or self.last_modified is not None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the entry was stored"""
+        return time.time() - self.stored_at
+
+
+class BaseCache:
+    """
+    Base class for response caches used by `Client`.
+
+    Keys are (domain, output_format) tuples. Subclasses implement
+    `_get`, `_set`, `delete` and `clear`; expiry checks and counters are
+    handled here. Expired entries with validators are kept, so `Client`
+    can revalidate them with a conditional request.
+    """
+    _ttl: float
+
+    def __init__(self, ttl: float = 3600):
+        """
+        :param ttl: float: Seconds a response stays valid, 3600 by default.
+        """
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self.ttl = ttl
+
+    @property
+    def ttl(self) -> float:
+        """Seconds a response stays valid"""
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, value: float):
+        if value is not None and value > 0:
+            self._ttl = value
+        else:
+            raise ValueError("TTL should be positive")
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """Number of entries dropped to respect the size bound"""
+        return self._evictions
+
+    @property
+    def expirations(self) -> int:
+        """Number of entries dropped after their TTL"""
+        return self._expirations
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+    def get(self, key: tuple) -> CacheEntry or None:
+        entry = self._get(key)
+        if entry is not None and entry.age > self.ttl:
+            if not entry.revalidatable:
+                self.delete(key)
+            self._count(expirations=1)
+            entry = None
+
+        if entry is None:
+            self._count(misses=1)
+        else:
+            self._count(hits=1)
+        return entry
+
+    def get_stale(self, key: tuple) -> CacheEntry or None:
+        """Get an entry whatever its age, without counting a lookup."""
+        return self._get(key)
+
+    def set(self, key: tuple, entry: CacheEntry):
+        self._set(key, entry)
+
+    def refresh(self, key: tuple, entry: CacheEntry):
+        """
+        Store an entry the API confirmed as current (304 Not Modified)
+        and count the preceding miss as a hit.
+        """
+        self._set(key, entry)
+        self._count(hits=1, misses=-1)
+
+    def delete(self, key: tuple):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def _get(self, key: tuple) -> CacheEntry or None:
+        raise NotImplementedError
+
+    def _set(self, key: tuple, entry: CacheEntry):
+        raise NotImplementedError
+
+    def _count(self, hits=0, misses=0, evictions=0, expirations=0):
+        with self._stats_lock:
+            self._hits += hits
+            self._misses += misses
+            self._evictions += evictions
+            self._expirations += expirations
@@ -0,0 +1,67 @@
+from collections import OrderedDict
+import threading
+
+from .base import BaseCache, CacheEntry
+
+
+class MemoryCache(BaseCache):
+    """
+    Thread-safe in-process cache with a TTL and an LRU size bound.
+    """
+    _max_size: int
+
+    def __init__(self, ttl: float = 3600, max_size: int = 10000):
+        """
+        :param ttl: float: Seconds a response stays valid, 3600 by default.
+        :param max_size: int: Max number of cached responses,
+            10000 by default.
+        """
+        super().__init__(ttl)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_size = max_size
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        """Max number of cached responses"""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: int):
+        if type(value) is not int or value < 1:
+            raise ValueError("Max size should be a positive integer")
+        self._max_size = value
+        with self._lock:
+            self._evict()
+
+    def delete(self, key: tuple):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key: tuple) -> CacheEntry or None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _set(self, key: tuple, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        evicted = 0
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            evicted += 1
+        if evicted:
+            self._count(evictions=evicted)
@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import threading
+import time
+
+from .base import BaseCache, CacheEntry
+
+
+class SqliteCache(BaseCache):
+    """
+    Disk-backed cache shared by several threads and processes.
+
+    The database runs in WAL mode, so any number of readers can work
+    alongside a single writer, and entries written by one process are
+    visible to every other process using the same file. Each thread
+    (and each forked process) opens its own connection.
+    """
+    _path: str
+
+    __SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS responses (
+            domain TEXT NOT NULL,
+            output_format TEXT NOT NULL,
+            raw BLOB NOT NULL,
+            stored_at REAL NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            PRIMARY KEY (domain, output_format)
+        ) WITHOUT ROWID
+    '''
+
+    def __init__(self, path: str, ttl: float = 86400,
+                 busy_timeout: float = 30):
+        """
+        :param path: str: Database file path, created if missing.
+        :param ttl: float: Seconds a response stays valid,
+            86400 by default.
+        :param busy_timeout: float: Seconds to wait for the write lock
+            held by another connection, 30 by default.
+        """
+        super().__init__(ttl)
+        self._path = os.fspath(path)
+        self._busy_timeout = busy_timeout
+        self._local = threading.local()
+
+        connection = self._connection()
+        with connection:
+            connection.execute(SqliteCache.__SCHEMA)
+            columns = {row[1] for row in connection.execute(
+                'PRAGMA table_info(responses)')}
+            # Files created by earlier versions lack the validators.
+            for column in ('etag', 'last_modified'):
+                if column not in columns:
+                    connection.execute(
+                        'ALTER TABLE responses ADD COLUMN {} TEXT'.format(
+                            column))
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __len__(self):
+        row = self._connection().execute(
+            'SELECT COUNT(*) FROM responses').fetchone()
+        return row[0]
+
+    def close(self):
+        """Close the connection opened by the current thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def delete(self, key: tuple):
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                'DELETE FROM responses WHERE domain = ? AND output_format = ?',
+                key)
+
+    def clear(self):
+        connection = self._connection()
+        with connection:
+            connection.execute('DELETE FROM responses')
+
+    def compact(self) -> int:
+        """
+        Drop expired entries and reclaim free disk space.
+
+        :return: number of deleted entries
+        """
+        connection = self._connection()
+        with connection:
+            deleted = connection.execute(
+                'DELETE FROM responses WHERE stored_at < ?',
+                (time.time() - self.ttl,)).rowcount
+        connection.execute('VACUUM')
+        connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        self._count(expirations=deleted)
+        return deleted
+
+    def _get(self, key: tuple) -> CacheEntry or None:
+        row = self._connection().execute(
+            'SELECT raw, stored_at, etag, last_modified FROM responses '
+            'WHERE domain = ? AND output_format = ?', key).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(*row)
+
+    def _set(self, key: tuple, entry: CacheEntry):
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO responses (domain, output_format, '
+                'raw, stored_at, etag, last_modified) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key[0], key[1], entry.raw, entry.stored_at, entry.etag,
+                 entry.last_modified))
+
+    def _connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            # Connections must not be shared with a forked child.
+            self._local.connection = None
+            self._local.pid = pid
+
+        if self._local.connection is None:
+            connection = sqlite3.connect(
+                self._path, timeout=self._busy_timeout)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return self._local.connection
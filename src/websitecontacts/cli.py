@@ -0,0 +1,243 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import zlib
+
+from .cache import SqliteCache
+from .client import Client
+from .streaming import _read_domains, _unique, _to_ndjson
+from .exceptions.error import ParameterError, BadRequestError
+
+API_KEY_ENV = 'WEBSITE_CONTACTS_API_KEY'
+MANIFEST = 'job.json'
+
+# Lookups failing with these errors would fail again, so they are
+# checkpointed like successful ones. Other failures are retried on resume.
+_PERMANENT_ERRORS = (ParameterError, BadRequestError)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='websitecontacts',
+        description='Look up the contacts of every domain listed in a file '
+                    'using several worker processes. Results are written '
+                    'as NDJSON shards; an interrupted job, or one with '
+                    'failed lookups, picks up where it stopped when run '
+                    'again with the same output directory.')
+    parser.add_argument('input', help='file with one domain or URL per line')
+    parser.add_argument('output', help='directory for results and progress')
+    parser.add_argument('--api-key', action='append', dest='api_keys',
+                        help='API key, may be repeated to use several keys '
+                             '(default: comma-separated keys from '
+                             '${})'.format(API_KEY_ENV))
+    parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                        help='number of worker processes and output shards '
+                             'for a new job (default: number of CPUs)')
+    parser.add_argument('--threads', type=int, default=10,
+                        help='concurrent lookups per process (default: 10)')
+    parser.add_argument('--batch-size', type=int,
+                        help='domains per POST request to an endpoint '
+                             'supporting batches (default: one GET request '
+                             'per domain)')
+    parser.add_argument('--hard-refresh', action='store_true',
+                        help='ask the API for fresh contacts')
+    parser.add_argument('--base-url', help='API endpoint URL')
+    parser.add_argument('--timeout', type=float, help='API call timeout')
+    parser.add_argument('--cache', help='SqliteCache file shared by workers')
+    args = parser.parse_args(argv)
+
+    api_keys = args.api_keys or [
+        k for k in os.environ.get(API_KEY_ENV, '').split(',') if k]
+    if not api_keys:
+        parser.error('an API key is required: use --api-key or set '
+                     '${}'.format(API_KEY_ENV))
+    if args.processes < 1 or args.threads < 1 \
+            or (args.batch_size is not None and args.batch_size < 1):
+        parser.error(
+            '--processes, --threads and --batch-size should be positive')
+
+    os.makedirs(args.output, exist_ok=True)
+    shards = _load_manifest(args.output, args.input, args.processes)
+
+    options = {'pooled': True, 'pool_size': args.threads}
+    if args.base_url is not None:
+        options['base_url'] = args.base_url
+    if args.timeout is not None:
+        options['timeout'] = args.timeout
+
+    jobs = [{
+        'shard': shard,
+        'shards': shards,
+        'input': args.input,
+        'output': args.output,
+        'api_keys': api_keys,
+        'options': options,
+        'cache': args.cache,
+        'threads': args.threads,
+        'batch_size': args.batch_size,
+        'hard_refresh': args.hard_refresh,
+    } for shard in range(shards)]
+
+    completed = skipped = failed = 0
+    with ProcessPoolExecutor(max_workers=shards) as executor:
+        for result in executor.map(run_shard, jobs):
+            completed += result['completed']
+            skipped += result['skipped']
+            failed += result['failed']
+
+    print('{} looked up, {} already done, {} failed'.format(
+        completed, skipped, failed))
+    return 1 if failed else 0
+
+
+def run_shard(job: dict) -> dict:
+    """
+    Look up the domains of one shard, resuming from its progress file.
+
+    Each finished domain is appended to `progress-NNNN.txt` after its
+    result line is flushed to `results-NNNN.ndjson`. Lookups failing
+    with a retryable error go to `errors-NNNN.ndjson` instead and are
+    tried again on the next run.
+
+    :return: dict with `completed`, `skipped` and `failed` counters
+    """
+    shard = job['shard']
+    results_path = os.path.join(
+        job['output'], 'results-{:04d}.ndjson'.format(shard))
+    progress_path = os.path.join(
+        job['output'], 'progress-{:04d}.txt'.format(shard))
+    errors_path = os.path.join(
+        job['output'], 'errors-{:04d}.ndjson'.format(shard))
+
+    done = _read_progress(progress_path)
+    _cut_partial_line(results_path)
+    _cut_partial_line(errors_path)
+    _recover_last_result(results_path, progress_path, done)
+    counters = {'completed': 0, 'skipped': 0, 'failed': 0}
+
+    def pending():
+        for domain in _unique(_read_domains(job['input']), 100000):
+            if _shard_of(domain, job['shards']) != shard:
+                continue
+            if domain in done:
+                counters['skipped'] += 1
+                continue
+            yield domain
+
+    options = dict(job['options'])
+    if job['cache'] is not None:
+        options['cache'] = SqliteCache(job['cache'])
+    client = Client(job['api_keys'], **options)
+
+    try:
+        with open(results_path, 'a', encoding='utf-8') as results, \
+                open(progress_path, 'a', encoding='utf-8') as progress, \
+                open(errors_path, 'a', encoding='utf-8') as errors:
+            for domain, result in client.get_many(
+                    pending(), job['hard_refresh'], job['threads'],
+                    batch_size=job['batch_size']):
+                if isinstance(result, Exception) \
+                        and not isinstance(result, _PERMANENT_ERRORS):
+                    errors.write(_to_ndjson(domain, result))
+                    errors.flush()
+                    counters['failed'] += 1
+                    continue
+                results.write(_to_ndjson(domain, result))
+                results.flush()
+                progress.write(domain + '\n')
+                progress.flush()
+                done.add(domain)
+                counters['completed'] += 1
+    finally:
+        client.close()
+
+    return counters
+
+
+def _shard_of(domain: str, shards: int) -> int:
+    return zlib.crc32(domain.encode('utf-8')) % shards
+
+
+def _load_manifest(output: str, source: str, processes: int) -> int:
+    path = os.path.join(output, MANIFEST)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as fp:
+            manifest = json.load(fp)
+        if manifest['input'] != os.path.abspath(source):
+            raise SystemExit('{} belongs to a job for {}'.format(
+                output, manifest['input']))
+        return manifest['shards']
+
+    with open(path, 'w', encoding='utf-8') as fp:
+        json.dump({'input': os.path.abspath(source), 'shards': processes}, fp)
+    return processes
+
+
+def _cut_partial_line(path: str):
+    """
+    Drop a last line left incomplete by a killed process, so appended
+    lines start on a line of their own.
+    """
+    if not os.path.exists(path):
+        return
+
+    with open(path, 'rb+') as fp:
+        end = fp.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - 65536)
+            fp.seek(start)
+            newline = fp.read(position - start).rfind(b'\n')
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            fp.truncate(position)
+
+
+def _recover_last_result(results_path: str, progress_path: str, done: set):
+    """
+    Checkpoint the last result of a process killed between writing it
+    and writing its progress line, so it isn't looked up again.
+    """
+    line = _last_line(results_path)
+    if line is None:
+        return
+    domain = json.loads(line)['domain']
+    if domain not in done:
+        with open(progress_path, 'a', encoding='utf-8') as progress:
+            progress.write(domain + '\n')
+        done.add(domain)
+
+
+def _last_line(path: str) -> str or None:
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as fp:
+        end = fp.seek(0, os.SEEK_END)
+        position = end - 1
+        while position > 0:
+            start = max(0, position - 65536)
+            fp.seek(start)
+            newline = fp.read(position - start).rfind(b'\n')
+            if newline >= 0:
+                start += newline + 1
+                break
+            position = start
+        else:
+            start = 0
+        if start >= end:
+            return None
+        fp.seek(start)
+        return fp.read(end - start).decode('utf-8').strip() or None
+
+
+def _read_progress(path: str) -> set:
+    _cut_partial_line(path)
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as fp:
+        return {line.rstrip('\n') for line in fp}
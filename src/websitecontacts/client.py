@@ -1,23 +1,37 @@
+from collections import deque
 import datetime
-from json import loads, JSONDecodeError
+from json import dumps, loads
 import re
-
-from .net.http import ApiRequester
+import time
+from typing import TYPE_CHECKING
+from xml.etree.ElementTree import ParseError
+
+from .cache.base import BaseCache, CacheEntry
+from .decoder import get_decoder
+from .domains import is_valid_domain
+from .instrumentation import Instrumentation
+from .keys import KeyPool
 from .models.response import Response
+from .models.xml_parser import parse_xml
+from .refresh import RefreshScheduler
+from .singleflight import SingleFlight
 from .exceptions.error import ParameterError, EmptyApiKeyError, \
-    UnparsableApiResponseError
+    UnparsableApiResponseError, ApiAuthError
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from .net.http import ApiRequester
 
 
 class Client:
     __default_url = "https://website-contacts.whoisxmlapi.com/api/v1"
-    _api_requester: ApiRequester or None
+    _api_requester: 'ApiRequester or None'
     _api_key: str
+    _cache: BaseCache or None
     _last_result: Response or None
 
-    _re_api_key = re.compile(r'^at_[a-z0-9]{29}$', re.IGNORECASE)
-    _re_domain_name = re.compile(
-        r'^(?:[0-9a-z_](?:[0-9a-z-_]{0,62}(?<=[0-9a-z-_])[0-9a-z_])?\.)+'
-        + r'[0-9a-z][0-9a-z-]{0,62}[a-z0-9]$', re.IGNORECASE)
+    # Compiled on first use to keep the import cheap.
+    _re_api_key = None
 
     _SUPPORTED_FORMATS = ['json', 'xml']
     _PARSABLE_FORMAT = 'json'
@@ -28,20 +42,77 @@ class Client:
     __DATETIME_OR_NONE_MSG = 'Value should be None or an instance of ' \
                              'datetime.date'
 
-    def __init__(self, api_key: str, **kwargs):
+    def __init__(self, api_key: str or list or KeyPool, **kwargs):
         """
-        :param api_key: str: Your API key.
+        :param api_key: str: Your API key. A list of keys or a `KeyPool`
+            spreads calls over several keys; a key rejected by the API
+            with 401, 402 or 403 is taken out of rotation and the call
+            is repeated with the next key.
+        :key key_strategy: str: (optional) KeyPool.ROUND_ROBIN (default)
+            or KeyPool.LEAST_LOADED, used when api_key is a list
         :key base_url: str: (optional) API endpoint URL.
         :key timeout: float: (optional) API call timeout in seconds
+        :key pooled: bool: (optional) reuse keep-alive connections
+            between calls, False by default
+        :key pool_size: int: (optional) max number of pooled connections
+        :key pool_idle_timeout: float: (optional) seconds after which
+            idle pooled connections are closed
+        :key rate_limit: float: (optional) max requests per second
+        :key rate_burst: int: (optional) max requests sent back to back
+        :key max_concurrency: int: (optional) max requests in flight
+        :key adaptive_concurrency: bool: (optional) adjust max_concurrency
+            to server load (AIMD)
+        :key retry: RetryPolicy: (optional) retry policy for failed calls
+        :key hedge: HedgePolicy: (optional) send a backup request for
+            calls slower than most recent ones and use the first answer
+        :key cache: BaseCache: (optional) cache for API responses,
+            e.g. `MemoryCache`. Expired responses the API sent an ETag
+            or Last-Modified header for are revalidated with a
+            conditional request
+        :key coalesce: bool: (optional) share one API call between
+            concurrent identical lookups, True by default
+        :key json_decoder: str or callable: (optional) 'json', 'orjson',
+            'ujson' or a function decoding bytes, the fastest installed
+            decoder by default
+        :key instrumentation: Instrumentation: (optional) timing and
+            error hooks
+        :key max_response_size: int: (optional) max response body size
+            in bytes; bodies are read into a reused buffer and larger
+            ones raise ResponseTooLargeError. Without a cache, `get`
+            decodes straight from that buffer
+        :key soft_ttl: float: (optional) seconds after which a cached
+            response is refreshed in the background, requires `cache`.
+            `get` keeps returning it until the refresh is done or the
+            cache TTL runs out
+        :key refresher: RefreshScheduler: (optional) pool running the
+            background refreshes, a 2-thread `RefreshScheduler` by
+            default
         """
 
         self._api_key = ''
+        self._key_pool = None
+        self._last_result = None
 
+        self._key_strategy = kwargs.pop('key_strategy', KeyPool.ROUND_ROBIN)
         self.api_key = api_key
+        self.cache = kwargs.pop('cache', None)
+        self._inflight = SingleFlight() if kwargs.pop('coalesce', True) \
+            else None
+        self._decoder = get_decoder(kwargs.pop('json_decoder', None))
+        self._instrumentation = kwargs.get('instrumentation')
+        self._soft_ttl = Client._validate_soft_ttl(
+            kwargs.pop('soft_ttl', None))
+        if self._soft_ttl is not None and self._cache is None:
+            raise ValueError("Soft TTL requires a cache")
+        self._refresher = kwargs.pop('refresher', None)
+        if self._soft_ttl is not None and self._refresher is None:
+            self._refresher = RefreshScheduler()
 
         if 'base_url' not in kwargs:
             kwargs['base_url'] = Client.__default_url
 
+        # The HTTP stack is only imported once a client is created.
+        from .net.http import ApiRequester
         self.api_requester = ApiRequester(**kwargs)
 
     @property
@@ -49,17 +120,45 @@ class Client:
         return self._api_key
 
     @api_key.setter
-    def api_key(self, value: str):
-        self._api_key = Client._validate_api_key(value)
+    def api_key(self, value: str or list or KeyPool):
+        self._key_pool = Client._validate_key_pool(value, self._key_strategy)
+        if self._key_pool is None:
+            self._api_key = Client._validate_api_key(value)
+        else:
+            self._api_key = self._key_pool.keys[0]
+
+    @property
+    def key_pool(self) -> KeyPool or None:
+        return self._key_pool
 
     @property
-    def api_requester(self) -> ApiRequester or None:
+    def key_usage(self) -> dict:
+        """Per-key counters when several API keys are used"""
+        if self._key_pool is None:
+            return {}
+        return self._key_pool.stats()
+
+    @property
+    def api_requester(self) -> 'ApiRequester or None':
         return self._api_requester
 
     @api_requester.setter
-    def api_requester(self, value: ApiRequester):
+    def api_requester(self, value: 'ApiRequester'):
         self._api_requester = value
 
+    @property
+    def cache(self) -> BaseCache or None:
+        return self._cache
+
+    @cache.setter
+    def cache(self, value: BaseCache or None):
+        if value is None or isinstance(value, BaseCache):
+            self._cache = value
+        else:
+            raise ValueError(
+                "Value should be an instance of "
+                "websitecontacts.cache.BaseCache or None")
+
     @property
     def base_url(self) -> str:
         return self._api_requester.base_url
@@ -71,6 +170,22 @@ class Client:
         else:
             self._api_requester.base_url = value
 
+    @property
+    def collapsed_requests(self) -> int:
+        """Number of lookups that shared a concurrent identical API call"""
+        if self._inflight is None:
+            return 0
+        return self._inflight.collapsed
+
+    @property
+    def refresher(self) -> RefreshScheduler or None:
+        """Pool running stale-while-revalidate refreshes"""
+        return self._refresher
+
+    @property
+    def soft_ttl(self) -> float or None:
+        return self._soft_ttl
+
     @property
     def last_result(self) -> Response or None:
         return self._last_result
@@ -93,14 +208,34 @@ class Client:
     def timeout(self, value: float):
         self._api_requester.timeout = value
 
-    def get(self, domain: str, hard_refresh: bool = False) -> Response:
+    def close(self):
+        """
+        Stop background refreshes and close pooled connections held by
+        the API requester.
+        """
+        if self._refresher is not None:
+            self._refresher.close()
+        self._api_requester.close()
+
+    def get(self, domain: str, hard_refresh: bool = False,
+            output_format: str = _PARSABLE_FORMAT) -> Response:
         """
         Get parsed API response as a `Response` instance.
 
+        With a cache configured, repeated lookups of a cached domain
+        return the same `Response` instance without calling the API.
+        `hard_refresh=True` bypasses the cache and repopulates it.
+        With `soft_ttl` set, a cached response older than that is
+        returned at once and refreshed with `hard_refresh=True` in the
+        background, the stalest ones first.
+
         :key domain: Required. The website's domain name.
         :key hard_refresh: Optional. Boolean.
             False (Default) for getting the cached contacts information if there is one.
             True for demanding the website contacts information from scratch.
+        :key output_format: Optional. Format requested from the API.
+            Use Client.JSON_FORMAT (Default) and Client.XML_FORMAT
+            constants
         :return: `Response` instance
         :raises ConnectionError:
         :raises WebsiteContactsApiError: Base class for all errors below
@@ -111,16 +246,58 @@ class Client:
         :raises ParameterError: invalid parameter's value
         """
 
-        response = self.get_raw(domain, hard_refresh, Client._PARSABLE_FORMAT)
-        try:
-            parsed = loads(str(response))
-            if 'domainName' in parsed:
-                self.last_result = Response(parsed)
-                return self.last_result
-            raise UnparsableApiResponseError(
-                "Could not find the correct root element.", None)
-        except JSONDecodeError as error:
-            raise UnparsableApiResponseError("Could not parse API response", error)
+        self.last_result = self._lookup(domain, hard_refresh, output_format)
+        return self.last_result
+
+    def get_many(self, domains, hard_refresh: bool = False,
+                 max_workers: int = 10, ordered: bool = False,
+                 batch_size: int or None = None):
+        """
+        Look up several domains on a bounded pool of worker threads.
+
+        Domains are consumed lazily and at most `2 * max_workers` lookups
+        are queued at a time, so arbitrarily long iterables are supported.
+        A failed lookup doesn't abort the batch: its exception is yielded
+        in place of the response. `last_result` is not updated.
+
+        For best throughput create the client with `pooled=True` and
+        a `pool_size` of at least `max_workers`.
+
+        With `batch_size`, domains missing from the cache are sent in
+        chunks of up to `batch_size` per POST request to an endpoint
+        implementing the batch contract: the request body is
+        `{"domainNames": [...], "hardRefresh": 0 or 1, "outputFormat":
+        "json"}`, the answer is `{"results": [...]}` with one lookup
+        response per domain, or an object with the domain's `domainName`,
+        an HTTP status `code` and `messages` for a failed domain.
+        With coalescing, domains already being fetched by a concurrent
+        `get` or batch are waited for instead of sent again.
+
+        :key domains: Required. Iterable of domain names.
+        :key hard_refresh: Optional. Boolean.
+        :key max_workers: Optional. Number of worker threads, 10 by default.
+        :key ordered: Optional. Boolean.
+            False (Default) for yielding results as they complete.
+            True for yielding results in input order.
+        :key batch_size: Optional. Max number of domains per API call.
+            None (Default) for one GET request per domain.
+        :return: generator of (domain, `Response` or exception) pairs
+        :raises ParameterError: invalid parameter's value
+        """
+
+        if type(max_workers) is not int or max_workers < 1:
+            raise ParameterError("max_workers should be a positive integer")
+
+        if batch_size is None:
+            return self._fan_out(
+                lambda domain: self._lookup(domain, hard_refresh),
+                domains, max_workers, ordered)
+
+        if type(batch_size) is not int or batch_size < 1:
+            raise ParameterError("batch_size should be a positive integer")
+
+        return self._get_batched(
+            domains, hard_refresh, max_workers, ordered, batch_size)
 
     def get_raw(self, domain: str, hard_refresh: bool = False, output_format: str = _PARSABLE_FORMAT) -> str:
         """
@@ -143,6 +320,32 @@ class Client:
         :raises ParameterError: invalid parameter's value
         """
 
+        return self.get_raw_bytes(
+            domain, hard_refresh, output_format).decode('UTF-8')
+
+    def get_raw_bytes(self, domain: str, hard_refresh: bool = False,
+                      output_format: str = _PARSABLE_FORMAT) -> bytes:
+        """
+        Get raw API response bytes without decoding them.
+
+        Accepts the same parameters and raises the same errors
+        as `get_raw`.
+
+        :return: bytes
+        """
+
+        try:
+            return self._get_entry(domain, hard_refresh, output_format).raw
+        except Exception as error:
+            if self._instrumentation is not None:
+                self._instrumentation.error(error)
+            raise
+
+    def _get_entry(self, domain: str, hard_refresh: bool,
+                   output_format: str, parse: bool = False) -> CacheEntry:
+        if self._instrumentation is not None:
+            started = time.perf_counter()
+
         if self.api_key == '':
             raise EmptyApiKeyError('')
 
@@ -150,24 +353,345 @@ class Client:
         _hard_refresh = 1 if hard_refresh else 0
         _output_format = Client._validate_output_format(output_format)
 
-        return self._api_requester.get(self._build_payload(
-            self.api_key,
-            _domain,
-            _hard_refresh,
-            _output_format,
-        ))
+        if self._instrumentation is not None:
+            self._instrumentation.timing(
+                Instrumentation.VALIDATION, time.perf_counter() - started)
+
+        key = (_domain, _output_format)
+        if self._cache is not None and not hard_refresh:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if self._soft_ttl is not None \
+                        and entry.age > self._soft_ttl:
+                    self._refresher.schedule(
+                        key, lambda: self._refresh(domain, output_format),
+                        entry.age)
+                return entry
+
+        def payload(api_key: str) -> dict:
+            return self._build_payload(
+                api_key,
+                _domain,
+                _hard_refresh,
+                _output_format,
+            )
+
+        def fetch() -> CacheEntry:
+            if parse and self._cache is None \
+                    and self._api_requester.max_response_size is not None:
+                # Decoded straight from the requester's read buffer,
+                # the raw body isn't kept.
+                fetched = CacheEntry(b'')
+                fetched.response = self._parse(self._with_key(
+                    lambda api_key: self._api_requester.get_view(
+                        payload(api_key))), _output_format)
+                return fetched
+
+            stale = None
+            if self._cache is not None and not hard_refresh:
+                stale = self._cache.get_stale(key)
+            if stale is None or not stale.revalidatable:
+                stale = CacheEntry(b'')
+
+            raw, etag, last_modified = self._with_key(
+                lambda api_key: self._api_requester.get_conditional(
+                    payload(api_key), stale.etag, stale.last_modified))
+
+            if raw is None:
+                fetched = CacheEntry(
+                    stale.raw, etag=etag, last_modified=last_modified)
+                fetched.response = stale.response
+                self._cache.refresh(key, fetched)
+                return fetched
+
+            fetched = CacheEntry(raw, etag=etag, last_modified=last_modified)
+            if self._cache is not None:
+                self._cache.set(key, fetched)
+            return fetched
+
+        if self._inflight is None:
+            return fetch()
+        return self._inflight.do(
+            (_domain, _hard_refresh, _output_format, parse), fetch)
+
+    def _get_batched(self, domains, hard_refresh: bool, max_workers: int,
+                     ordered: bool, batch_size: int):
+        chunks = Client._chunks(domains, batch_size)
+        for chunk, results in self._fan_out(
+                lambda c: self._lookup_batch(c, hard_refresh),
+                chunks, max_workers, ordered):
+            if isinstance(results, Exception):
+                results = [(domain, results) for domain in chunk]
+            yield from results
+
+    def _lookup_batch(self, domains: list, hard_refresh: bool) -> list:
+        results = [None] * len(domains)
+        pending = {}
+
+        for index, domain in enumerate(domains):
+            try:
+                if self.api_key == '':
+                    raise EmptyApiKeyError('')
+                _domain = Client._validate_domain_name(domain)
+                entry = None
+                if self._cache is not None and not hard_refresh:
+                    entry = self._cache.get((_domain, Client.JSON_FORMAT))
+                if entry is None:
+                    pending.setdefault(_domain.lower(), []).append(
+                        (index, _domain))
+                    continue
+                if entry.response is None:
+                    entry.response = Client._parse_response(
+                        entry.raw, self._decoder, self._instrumentation)
+                results[index] = entry.response
+            except Exception as error:
+                results[index] = error
+
+        if pending:
+            found = self._fetch_pending(list(pending), hard_refresh)
+            missing = UnparsableApiResponseError(
+                "Batch response has no result for the domain", None)
+            for name, requested in pending.items():
+                result = found.get(name)
+                if result is None:
+                    result = missing
+                if isinstance(result, CacheEntry):
+                    if result.response is None:
+                        # Fetched by a concurrent `get`.
+                        result.response = Client._parse_response(
+                            result.raw, self._decoder,
+                            self._instrumentation)
+                    if self._cache is not None:
+                        for _domain in {d for _, d in requested}:
+                            self._cache.set(
+                                (_domain, Client.JSON_FORMAT), result)
+                    result = result.response
+                for index, _ in requested:
+                    results[index] = result
+
+        if self._instrumentation is not None:
+            for result in results:
+                if isinstance(result, Exception):
+                    self._instrumentation.error(result)
+        return list(zip(domains, results))
+
+    def _fetch_pending(self, domains: list, hard_refresh: bool) -> dict:
+        """
+        Fetch cache misses of a batch. With coalescing, domains already
+        being fetched by a `get` or another batch are waited for, under
+        the keys `get` uses for lowercase JSON lookups, and only the
+        rest is sent.
+
+        :return: dict of lowercase domain name to `CacheEntry` or to
+            the exception for the domain; None if the API sent nothing
+        """
+        def fetch(names: list) -> dict:
+            try:
+                return self._fetch_batch(names, hard_refresh)
+            except Exception as error:
+                return {name: error for name in names}
+
+        if self._inflight is None:
+            return fetch(domains)
+
+        _hard_refresh = 1 if hard_refresh else 0
+        found = self._inflight.do_many(
+            [(name, _hard_refresh, Client.JSON_FORMAT, True)
+             for name in domains],
+            lambda keys: {
+                (name, _hard_refresh, Client.JSON_FORMAT, True): result
+                for name, result in fetch([k[0] for k in keys]).items()})
+        return {key[0]: result for key, result in found.items()}
+
+    def _fetch_batch(self, domains: list, hard_refresh: bool) -> dict:
+        """
+        :return: dict of lowercase domain name to `CacheEntry` holding
+            the parsed response, or to the exception for the domain
+        """
+        raw = self._with_key(lambda api_key: self._api_requester.post_bytes({
+            'apiKey': api_key,
+            'domainNames': domains,
+            'hardRefresh': 1 if hard_refresh else 0,
+            'outputFormat': Client.JSON_FORMAT,
+        }))
+
+        try:
+            items = self._decoder(raw)['results']
+        except (ValueError, KeyError, TypeError) as error:
+            raise UnparsableApiResponseError(
+                "Could not parse batch API response", error)
+
+        found = {}
+        for item in items:
+            if not isinstance(item, dict) or 'domainName' not in item:
+                continue
+            name = str(item['domainName']).lower()
+            if 'code' in item and 'messages' in item:
+                found[name] = self._api_requester._error_for_status(
+                    int(item['code']), dumps(item))
+            else:
+                found[name] = CacheEntry(dumps(item).encode('utf-8'))
+                found[name].response = Response(item)
+        return found
+
+    @staticmethod
+    def _chunks(items, size: int):
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _with_key(self, call):
+        if self._key_pool is None:
+            return call(self.api_key)
+
+        while True:
+            api_key = self._key_pool.acquire()
+            try:
+                result = call(api_key)
+            except ApiAuthError as error:
+                self._key_pool.release(api_key, error)
+                self._key_pool.disable(api_key)
+                if not self._key_pool.active_keys:
+                    raise
+                continue
+            except Exception as error:
+                self._key_pool.release(api_key, error)
+                raise
+            self._key_pool.release(api_key)
+            return result
+
+    def _refresh(self, domain: str, output_format: str):
+        try:
+            self._get_entry(domain, True, output_format)
+        except Exception as error:
+            if self._instrumentation is not None:
+                self._instrumentation.error(error)
+            raise
+
+    def _lookup(self, domain: str, hard_refresh: bool,
+                output_format: str = _PARSABLE_FORMAT) -> Response:
+        try:
+            entry = self._get_entry(
+                domain, hard_refresh, output_format, True)
+            if entry.response is None:
+                entry.response = self._parse(entry.raw, output_format)
+            return entry.response
+        except Exception as error:
+            if self._instrumentation is not None:
+                self._instrumentation.error(error)
+            raise
+
+    def _parse(self, raw: bytes or memoryview,
+               output_format: str) -> Response:
+        if output_format.lower() == Client.XML_FORMAT:
+            decoder = parse_xml
+        else:
+            decoder = self._decoder
+        return Client._parse_response(raw, decoder, self._instrumentation)
+
+    @staticmethod
+    def _fan_out(func, items, max_workers: int, ordered: bool):
+        from concurrent.futures import ThreadPoolExecutor, wait, \
+            FIRST_COMPLETED
+
+        window = max_workers * 2
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            if ordered:
+                queue = deque()
+                for item in items:
+                    queue.append((item, executor.submit(func, item)))
+                    if len(queue) >= window:
+                        item, future = queue.popleft()
+                        yield item, Client._outcome(future)
+                while queue:
+                    item, future = queue.popleft()
+                    yield item, Client._outcome(future)
+            else:
+                pending = {}
+                for item in items:
+                    pending[executor.submit(func, item)] = item
+                    if len(pending) >= window:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield pending.pop(future), Client._outcome(future)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), Client._outcome(future)
+
+    @staticmethod
+    def _outcome(future: 'Future'):
+        error = future.exception()
+        if error is not None:
+            return error
+        return future.result()
+
+    @staticmethod
+    def _parse_response(response: bytes or memoryview or str, decoder=loads,
+                        instrumentation: Instrumentation = None) -> Response:
+        if instrumentation is not None:
+            started = time.perf_counter()
+
+        try:
+            parsed = decoder(response)
+        except (ValueError, ParseError) as error:
+            raise UnparsableApiResponseError(
+                "Could not parse API response", error)
+
+        if instrumentation is not None:
+            decoded = time.perf_counter()
+            instrumentation.timing(Instrumentation.DECODE, decoded - started)
+
+        if isinstance(parsed, dict) and 'domainName' in parsed:
+            result = Response(parsed)
+            if instrumentation is not None:
+                instrumentation.timing(
+                    Instrumentation.MODEL_BUILD, time.perf_counter() - decoded)
+            return result
+        raise UnparsableApiResponseError(
+            "Could not find the correct root element.", None)
 
     @staticmethod
     def _validate_api_key(api_key) -> str:
+        if Client._re_api_key is None:
+            Client._re_api_key = re.compile(
+                r'^at_[a-z0-9]{29}$', re.IGNORECASE)
         if Client._re_api_key.search(str(api_key)):
             return str(api_key)
         else:
             raise ParameterError("Invalid API key format.")
 
+    @staticmethod
+    def _validate_key_pool(value, strategy: str) -> KeyPool or None:
+        if isinstance(value, (list, tuple)):
+            value = KeyPool(
+                [Client._validate_api_key(key) for key in value], strategy)
+        elif isinstance(value, KeyPool):
+            for key in value.keys:
+                Client._validate_api_key(key)
+        else:
+            return None
+        return value
+
+    @staticmethod
+    def _validate_soft_ttl(value) -> float or None:
+        if value is None:
+            return None
+        if isinstance(value, bool) or not isinstance(value, (int, float)) \
+                or value <= 0:
+            raise ValueError("Soft TTL should be positive")
+        return value
+
     @staticmethod
     def _validate_domain_name(value) -> str:
-        if Client._re_domain_name.search(str(value)):
-            return str(value)
+        domain = str(value)
+        if is_valid_domain(domain.lower()):
+            return domain
 
         raise ParameterError("Invalid domain name")
 
@@ -0,0 +1,53 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+
+def _from_buffer(loads):
+    """Wrap a decoder that can't read memoryviews."""
+    def decode(raw):
+        if isinstance(raw, memoryview):
+            raw = raw.tobytes()
+        return loads(raw)
+    return decode
+
+
+_DECODERS = {
+    'json': _from_buffer(json.loads),
+    'orjson': orjson.loads if orjson is not None else None,
+    'ujson': _from_buffer(ujson.loads) if ujson is not None else None,
+}
+
+
+def get_decoder(name=None):
+    """
+    Get a JSON decoding function accepting bytes or a memoryview.
+
+    :param name: str or callable: (optional) 'json', 'orjson', 'ujson' or
+        a custom function. The fastest installed decoder is picked when
+        omitted. Decoders must raise ValueError on invalid input, custom
+        ones get a memoryview when the requester has max_response_size
+        set.
+    :return: callable
+    """
+    if callable(name):
+        return name
+
+    if name is None:
+        for candidate in ('orjson', 'ujson', 'json'):
+            if _DECODERS[candidate] is not None:
+                return _DECODERS[candidate]
+
+    if name not in _DECODERS:
+        raise ValueError("Unknown JSON decoder: {}".format(name))
+    if _DECODERS[name] is None:
+        raise ValueError("JSON decoder {} is not installed".format(name))
+    return _DECODERS[name]
@@ -0,0 +1,97 @@
+import string
+
+from .exceptions.error import ParameterError
+
+# Bytes allowed in a domain name, deleted by bytes.translate().
+_ALLOWED = (string.ascii_lowercase + string.digits + '-_.').encode('ascii')
+_MAX_LABEL_LENGTH = 64
+
+
+def is_valid_domain(value: str) -> bool:
+    """
+    Check a lowercase domain name without backtracking.
+
+    Valid names have two or more dot-separated labels made of letters,
+    digits, hyphens and underscores, at most 64 characters each, not
+    starting or ending with a hyphen. The last label has no underscores
+    and is at least two characters long.
+
+    Uses only C-level string operations, so the cost is linear in the
+    length of the name.
+    """
+    if not value:
+        return False
+    try:
+        # str.isascii() needs Python 3.7.
+        encoded = value.encode('ascii')
+    except UnicodeEncodeError:
+        return False
+    if encoded.translate(None, _ALLOWED) \
+            or value[0] in '.-' or value[-1] in '.-' \
+            or '..' in value or '.-' in value or '-.' in value:
+        return False
+
+    tld = value.rpartition('.')[2]
+    if len(tld) < 2 or len(tld) == len(value) or '_' in tld:
+        return False
+
+    # Only long names can hold a label over the limit.
+    if len(value) > _MAX_LABEL_LENGTH:
+        return all(len(label) <= _MAX_LABEL_LENGTH
+                   for label in value.split('.'))
+    return True
+
+
+def normalize_domain(value) -> str:
+    """
+    Turn a URL or a loosely written domain name into the form expected
+    by the API.
+
+    Lowercases the value; strips surrounding whitespace, the scheme,
+    credentials, port, path, query, fragment, a leading `www.` and
+    trailing dots; encodes internationalized names with IDNA.
+
+    :raises ParameterError: the result isn't a valid domain name
+    """
+    domain = str(value).strip().lower()
+    # Most inputs are already plain domain names.
+    if not domain.startswith('www.') and is_valid_domain(domain):
+        return domain
+
+    if '://' in domain:
+        domain = domain.split('://', 1)[1]
+    for separator in '/?#':
+        domain = domain.split(separator, 1)[0]
+    domain = domain.rsplit('@', 1)[-1].split(':', 1)[0].rstrip('.')
+    if domain.startswith('www.'):
+        domain = domain[4:]
+
+    try:
+        domain.encode('ascii')
+    except UnicodeEncodeError:
+        try:
+            domain = domain.encode('idna').decode('ascii')
+        except UnicodeError:
+            raise ParameterError("Invalid domain name")
+
+    if not is_valid_domain(domain):
+        raise ParameterError("Invalid domain name")
+    return domain
+
+
+def normalize_domains(values) -> (list, list):
+    """
+    Normalize many domain names before any network call.
+
+    :param values: Iterable of domain names, URLs or text lines.
+    :return: (valid, invalid) lists: normalized domain names in input
+        order, and the input values that could not be normalized
+    """
+    valid = []
+    invalid = []
+    for value in values:
+        try:
+            valid.append(normalize_domain(value))
+        except ParameterError:
+            invalid.append(value)
+    return valid, invalid
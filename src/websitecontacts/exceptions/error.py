@@ -3,8 +3,19 @@ from ..models.response import ErrorMessage
 
 
 class WebsiteContactsApiError(Exception):
-    def __init__(self, message):
+    __slots__ = ('_message', 'status_code', 'latency')
+
+    def __init__(self, message, status_code: int or None = None,
+                 latency: float or None = None):
+        """
+        :param message: Error message or raw API response body.
+        :param status_code: int: (optional) HTTP status code
+        :param latency: float: (optional) seconds the API call took
+        """
+        super().__init__(message)
         self.message = message
+        self.status_code = status_code
+        self.latency = latency
 
     @property
     def message(self):
@@ -15,39 +26,65 @@ class WebsiteContactsApiError(Exception):
         self._message = message
 
     def __str__(self):
-        return str(self.__dict__)
+        if self.status_code is None:
+            return str(self._message)
+        return '{}: {}'.format(self.status_code, self._message)
+
+    def __reduce__(self):
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return type(self), self.args, state
 
 
 class ParameterError(WebsiteContactsApiError):
-    pass
+    __slots__ = ()
 
 
 class EmptyApiKeyError(WebsiteContactsApiError):
-    pass
+    __slots__ = ()
 
 
 class ResponseError(WebsiteContactsApiError):
-    def __init__(self, message):
-        self.message = message
+    """
+    Error answer of the API. The response body is parsed into
+    `parsed_message` on first access only.
+    """
+    __slots__ = ('_parsed_message', '_parsed')
+
+    def __init__(self, message, status_code: int or None = None,
+                 latency: float or None = None):
+        super().__init__(message, status_code, latency)
         self._parsed_message = None
-        try:
-            parsed = loads(message)
-            self.parsed_message = ErrorMessage(parsed)
-        except Exception:
-            pass
+        self._parsed = False
 
     @property
-    def parsed_message(self):
+    def parsed_message(self) -> ErrorMessage or None:
+        if not self._parsed:
+            self._parsed = True
+            message = self.message
+            # Skips HTML error pages and the like without a parse attempt.
+            if isinstance(message, (str, bytes)) \
+                    and message.lstrip()[:1] in ('{', b'{'):
+                try:
+                    self._parsed_message = ErrorMessage(loads(message))
+                except Exception:
+                    pass
         return self._parsed_message
 
     @parsed_message.setter
     def parsed_message(self, pm):
+        self._parsed = True
         self._parsed_message = pm
 
 
 class UnparsableApiResponseError(WebsiteContactsApiError):
+    __slots__ = ('_original_error',)
+
     def __init__(self, message, origin_error):
-        self.message = message
+        super().__init__(message)
         self.original_error = origin_error
 
     @property
@@ -58,14 +95,22 @@ class UnparsableApiResponseError(WebsiteContactsApiError):
     def original_error(self, oe):
         self._original_error = oe
 
+    def __reduce__(self):
+        cls, _, state = super().__reduce__()
+        return cls, (self.message, self.original_error), state
+
 
 class ApiAuthError(ResponseError):
-    pass
+    __slots__ = ()
 
 
 class BadRequestError(ResponseError):
-    pass
+    __slots__ = ()
 
 
 class HttpApiError(WebsiteContactsApiError):
-    pass
+    __slots__ = ()
+
+
+class ResponseTooLargeError(WebsiteContactsApiError):
+    __slots__ = ()
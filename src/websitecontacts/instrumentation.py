@@ -0,0 +1,128 @@
+import threading
+
+
+class Instrumentation:
+    """
+    Timing and error hooks for `Client` and `ApiRequester`.
+
+    Timing callbacks are called as `callback(stage, seconds)` with one of
+    the stage constants below, error callbacks as
+    `callback(error_name)` with the class name of the raised exception.
+    Callbacks run on the thread making the call and must be fast.
+
+    When no instrumentation is passed to the client none of the hooks is
+    evaluated.
+    """
+    VALIDATION = 'validation'
+    CONNECT = 'connect'
+    TIME_TO_FIRST_BYTE = 'ttfb'
+    BODY_READ = 'body_read'
+    REQUEST = 'request'
+    DECODE = 'decode'
+    MODEL_BUILD = 'model_build'
+
+    STAGES = (VALIDATION, CONNECT, TIME_TO_FIRST_BYTE, BODY_READ, REQUEST,
+              DECODE, MODEL_BUILD)
+
+    def __init__(self):
+        self._timing_callbacks = []
+        self._error_callbacks = []
+
+    def on_timing(self, callback):
+        """Register a `callback(stage, seconds)`."""
+        self._timing_callbacks.append(callback)
+        return callback
+
+    def on_error(self, callback):
+        """Register a `callback(error_name)`."""
+        self._error_callbacks.append(callback)
+        return callback
+
+    def timing(self, stage: str, seconds: float):
+        for callback in self._timing_callbacks:
+            callback(stage, seconds)
+
+    def error(self, error: BaseException):
+        name = type(error).__name__
+        for callback in self._error_callbacks:
+            callback(name)
+
+
+class PrometheusExporter:
+    """
+    Aggregates stage timings and error counts and renders them in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self, namespace: str = 'websitecontacts'):
+        self._namespace = namespace
+        self._lock = threading.Lock()
+        self._sums = {}
+        self._counts = {}
+        self._errors = {}
+
+    def attach(self, instrumentation: Instrumentation):
+        instrumentation.on_timing(self._record_timing)
+        instrumentation.on_error(self._record_error)
+        return self
+
+    def render(self) -> str:
+        stage_metric = '{}_stage_seconds'.format(self._namespace)
+        error_metric = '{}_errors_total'.format(self._namespace)
+        with self._lock:
+            lines = ['# TYPE {} summary'.format(stage_metric)]
+            for stage in sorted(self._counts):
+                lines.append('{}_sum{{stage="{}"}} {:.9f}'.format(
+                    stage_metric, stage, self._sums[stage]))
+                lines.append('{}_count{{stage="{}"}} {}'.format(
+                    stage_metric, stage, self._counts[stage]))
+            lines.append('# TYPE {} counter'.format(error_metric))
+            for name in sorted(self._errors):
+                lines.append('{}{{error="{}"}} {}'.format(
+                    error_metric, name, self._errors[name]))
+        return '\n'.join(lines) + '\n'
+
+    def _record_timing(self, stage: str, seconds: float):
+        with self._lock:
+            self._sums[stage] = self._sums.get(stage, 0.0) + seconds
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    def _record_error(self, name: str):
+        with self._lock:
+            self._errors[name] = self._errors.get(name, 0) + 1
+
+
+class StatsdExporter:
+    """
+    Sends stage timings (`<prefix>.<stage>:<ms>|ms`) and error counts
+    (`<prefix>.errors.<name>:1|c`) to a StatsD server over UDP.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 8125,
+                 prefix: str = 'websitecontacts'):
+        self._address = (host, port)
+        self._prefix = prefix
+        import socket
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def attach(self, instrumentation: Instrumentation):
+        instrumentation.on_timing(self._send_timing)
+        instrumentation.on_error(self._send_error)
+        return self
+
+    def close(self):
+        self._socket.close()
+
+    def _send_timing(self, stage: str, seconds: float):
+        self._send('{}.{}:{:.3f}|ms'.format(
+            self._prefix, stage, seconds * 1000))
+
+    def _send_error(self, name: str):
+        self._send('{}.errors.{}:1|c'.format(self._prefix, name))
+
+    def _send(self, line: str):
+        try:
+            self._socket.sendto(line.encode('utf-8'), self._address)
+        except OSError:
+            pass
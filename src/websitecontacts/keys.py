@@ -0,0 +1,104 @@
+import threading
+
+from .exceptions.error import EmptyApiKeyError
+
+
+class KeyPool:
+    """
+    Spreads API calls over several API keys.
+
+    Keys are picked in turn (`ROUND_ROBIN`) or by the fewest calls in
+    flight (`LEAST_LOADED`). A key rejected by the API with 401, 402 or
+    403 is disabled and no longer handed out.
+    """
+
+    ROUND_ROBIN = 'round_robin'
+    LEAST_LOADED = 'least_loaded'
+
+    _STRATEGIES = (ROUND_ROBIN, LEAST_LOADED)
+
+    def __init__(self, keys, strategy: str = ROUND_ROBIN):
+        """
+        :param keys: list: API keys, at least one.
+        :param strategy: str: KeyPool.ROUND_ROBIN (default) or
+            KeyPool.LEAST_LOADED
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            raise ValueError("At least one API key is required")
+        if strategy not in KeyPool._STRATEGIES:
+            raise ValueError(
+                "Strategy should be one of: " + ', '.join(KeyPool._STRATEGIES))
+
+        self._lock = threading.Lock()
+        self._keys = keys
+        self._strategy = strategy
+        self._next = 0
+        self._usage = {key: {
+            'requests': 0,
+            'errors': 0,
+            'in_flight': 0,
+            'active': True,
+        } for key in keys}
+
+    @property
+    def keys(self) -> list:
+        return list(self._keys)
+
+    @property
+    def active_keys(self) -> list:
+        with self._lock:
+            return [k for k in self._keys if self._usage[k]['active']]
+
+    @property
+    def strategy(self) -> str:
+        return self._strategy
+
+    def acquire(self) -> str:
+        """
+        Pick a key for the next API call and count it as in flight.
+
+        :raises EmptyApiKeyError: all keys are disabled
+        """
+        with self._lock:
+            active = [k for k in self._keys if self._usage[k]['active']]
+            if not active:
+                raise EmptyApiKeyError("All API keys are disabled")
+
+            if self._strategy == KeyPool.LEAST_LOADED:
+                key = min(active, key=lambda k: (
+                    self._usage[k]['in_flight'], self._usage[k]['requests']))
+            else:
+                key = active[self._next % len(active)]
+                self._next += 1
+
+            usage = self._usage[key]
+            usage['requests'] += 1
+            usage['in_flight'] += 1
+            return key
+
+    def release(self, key: str, error: Exception or None = None):
+        """Mark the call made with `key` as finished."""
+        with self._lock:
+            usage = self._usage[key]
+            usage['in_flight'] -= 1
+            if error is not None:
+                usage['errors'] += 1
+
+    def disable(self, key: str):
+        """Take a key out of rotation."""
+        with self._lock:
+            self._usage[key]['active'] = False
+
+    def enable(self, key: str):
+        """Put a disabled key back into rotation."""
+        with self._lock:
+            self._usage[key]['active'] = True
+
+    def stats(self) -> dict:
+        """Per-key counters: requests, errors, in_flight and active"""
+        with self._lock:
+            return {k: dict(v) for k, v in self._usage.items()}
+
+    def __len__(self):
+        return len(self._keys)
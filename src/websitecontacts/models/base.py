@@ -1,11 +1,21 @@
 class BaseModel:
+    """
+    Base class for API models.
+
+    Subclasses define `__slots__` for storage and list their public
+    attribute names in `_fields`, which drives string conversion,
+    comparison, item access and `to_dict`.
+    """
+    __slots__ = ()
+    _fields = ()
+
     def __init__(self):
         pass
 
     def __str__(self):
         result = {}
-        for k, v in self.__dict__.items():
-            result[k] = str(v)
+        for k in self._fields:
+            result[k] = str(getattr(self, k))
         return str(result)
 
     def __repr__(self):
@@ -13,12 +23,23 @@ class BaseModel:
 
     def __eq__(self, other):
         is_equal = isinstance(other, self.__class__)
-        for k, v in self.__dict__.items():
-            is_equal = is_equal and (other.__dict__.get(k) == v)
+        for k in self._fields:
+            is_equal = is_equal and (getattr(other, k) == getattr(self, k))
 
         return is_equal
 
+    def to_dict(self) -> dict:
+        result = {}
+        for k in self._fields:
+            v = getattr(self, k)
+            if isinstance(v, BaseModel):
+                v = v.to_dict()
+            elif isinstance(v, list):
+                v = [x.to_dict() if isinstance(x, BaseModel) else x for x in v]
+            result[k] = v
+        return result
+
     def __getitem__(self, item):
-        if type(item) is str and item in self.__dict__:
-            return self.__dict__[item]
+        if type(item) is str and item in self._fields:
+            return getattr(self, item)
         raise KeyError("Invalid key: {}".format(item))
@@ -0,0 +1,269 @@
+from array import array
+import csv
+import json
+
+from .response import Response
+
+
+def _import_pyarrow():
+    # Imported on first use: pyarrow takes longer to load than the rest
+    # of the package.
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:  # pragma: no cover - optional dependency
+        raise ImportError(
+            "ResponseBatch.to_arrow requires pyarrow. "
+            "Install it with: pip install website-contacts[arrow]")
+    return pyarrow
+
+
+class ResponseBatch:
+    """
+    Column-oriented container for many API responses.
+
+    Scalar fields are stored one list per field. Emails, phones, company
+    names and postal addresses are flattened into value columns indexed by
+    offset arrays: the values of row `i` are
+    `values[offsets[i]:offsets[i + 1]]`.
+    Rows are appended straight from decoded API payloads, so no `Response`
+    objects are created.
+    """
+    SCALAR_COLUMNS = ('domain_name', 'country_code', 'meta_title',
+                      'meta_description', 'social_facebook',
+                      'social_instagram', 'social_linkedin',
+                      'social_twitter')
+    EMAIL_COLUMNS = ('description', 'email')
+    PHONE_COLUMNS = ('call_hours', 'description', 'phone_number')
+
+    def __init__(self):
+        for name in ResponseBatch.SCALAR_COLUMNS:
+            setattr(self, name, [])
+        self.website_responded = array('b')
+
+        self.company_names = []
+        self.company_name_offsets = array('q', [0])
+        self.postal_addresses = []
+        self.postal_address_offsets = array('q', [0])
+
+        self.email_description = []
+        self.email_email = []
+        self.email_offsets = array('q', [0])
+
+        self.phone_call_hours = []
+        self.phone_description = []
+        self.phone_phone_number = []
+        self.phone_offsets = array('q', [0])
+
+    def __len__(self):
+        return len(self.domain_name)
+
+    @classmethod
+    def from_payloads(cls, payloads) -> 'ResponseBatch':
+        """
+        :param payloads: Iterable of decoded API responses (dicts).
+        """
+        batch = cls()
+        for payload in payloads:
+            batch.append(payload)
+        return batch
+
+    @classmethod
+    def from_responses(cls, responses) -> 'ResponseBatch':
+        """
+        :param responses: Iterable of `Response` instances.
+        """
+        batch = cls()
+        for response in responses:
+            batch.append_response(response)
+        return batch
+
+    def append_raw(self, raw: bytes or str, decoder=json.loads):
+        """Append a raw JSON API response."""
+        self.append(decoder(raw))
+
+    def append(self, values: dict):
+        """Append a decoded API response."""
+        meta = values.get('meta') or {}
+        social = values.get('socialLinks') or {}
+
+        self.domain_name.append(_string(values.get('domainName')))
+        self.country_code.append(_string(values.get('countryCode')))
+        self.meta_title.append(_string(meta.get('title')))
+        self.meta_description.append(_string(meta.get('description')))
+        self.social_facebook.append(_string(social.get('facebook')))
+        self.social_instagram.append(_string(social.get('instagram')))
+        self.social_linkedin.append(_string(social.get('linkedIn')))
+        self.social_twitter.append(_string(social.get('twitter')))
+        self.website_responded.append(bool(values.get('websiteResponded')))
+
+        _extend(self.company_names, self.company_name_offsets,
+                values.get('companyNames'))
+        _extend(self.postal_addresses, self.postal_address_offsets,
+                values.get('postalAddresses'))
+
+        emails = _list(values.get('emails'))
+        for email in emails:
+            self.email_description.append(_string(email.get('description')))
+            self.email_email.append(_string(email.get('email')))
+        self.email_offsets.append(self.email_offsets[-1] + len(emails))
+
+        phones = _list(values.get('phones'))
+        for phone in phones:
+            self.phone_call_hours.append(_string(phone.get('callHours')))
+            self.phone_description.append(_string(phone.get('description')))
+            self.phone_phone_number.append(_string(phone.get('phoneNumber')))
+        self.phone_offsets.append(self.phone_offsets[-1] + len(phones))
+
+    def append_response(self, response: Response):
+        """Append a `Response` instance."""
+        for name in ResponseBatch.SCALAR_COLUMNS:
+            getattr(self, name).append(getattr(response, name))
+        self.website_responded.append(bool(response.website_responded))
+
+        _extend(self.company_names, self.company_name_offsets,
+                response.company_names)
+        _extend(self.postal_addresses, self.postal_address_offsets,
+                response.postal_addresses)
+
+        for email in response.emails:
+            self.email_description.append(email.description)
+            self.email_email.append(email.email)
+        self.email_offsets.append(
+            self.email_offsets[-1] + len(response.emails))
+
+        for phone in response.phones:
+            self.phone_call_hours.append(phone.call_hours)
+            self.phone_description.append(phone.description)
+            self.phone_phone_number.append(phone.phone_number)
+        self.phone_offsets.append(
+            self.phone_offsets[-1] + len(response.phones))
+
+    def to_ndjson(self, fp):
+        """
+        Write one JSON object per response, with the same keys
+        as `Response.to_dict()`.
+        """
+        for i in range(len(self)):
+            row = {name: getattr(self, name)[i]
+                   for name in ResponseBatch.SCALAR_COLUMNS}
+            row['website_responded'] = bool(self.website_responded[i])
+            row['company_names'] = _slice(
+                self.company_names, self.company_name_offsets, i)
+            row['postal_addresses'] = _slice(
+                self.postal_addresses, self.postal_address_offsets, i)
+            start, end = self.email_offsets[i], self.email_offsets[i + 1]
+            row['emails'] = [
+                {'description': d, 'email': e} for d, e in zip(
+                    self.email_description[start:end],
+                    self.email_email[start:end])]
+            start, end = self.phone_offsets[i], self.phone_offsets[i + 1]
+            row['phones'] = [
+                {'call_hours': c, 'description': d, 'phone_number': p}
+                for c, d, p in zip(
+                    self.phone_call_hours[start:end],
+                    self.phone_description[start:end],
+                    self.phone_phone_number[start:end])]
+            fp.write(json.dumps(row, ensure_ascii=False))
+            fp.write('\n')
+
+    def to_csv(self, fp, table: str = 'responses'):
+        """
+        Write a table as CSV.
+
+        :param fp: Text file object opened with `newline=''`.
+        :param table: str: 'responses' (scalar fields, one row per
+            response), 'emails' or 'phones' (one row per item, keyed by
+            `domain_name`).
+        """
+        writer = csv.writer(fp)
+        if table == 'responses':
+            writer.writerow(
+                ResponseBatch.SCALAR_COLUMNS + ('website_responded',))
+            writer.writerows(zip(
+                *[getattr(self, c) for c in ResponseBatch.SCALAR_COLUMNS],
+                map(bool, self.website_responded)))
+        elif table == 'emails':
+            writer.writerow(('domain_name',) + ResponseBatch.EMAIL_COLUMNS)
+            writer.writerows(zip(
+                self._row_domains(self.email_offsets),
+                self.email_description, self.email_email))
+        elif table == 'phones':
+            writer.writerow(('domain_name',) + ResponseBatch.PHONE_COLUMNS)
+            writer.writerows(zip(
+                self._row_domains(self.phone_offsets),
+                self.phone_call_hours, self.phone_description,
+                self.phone_phone_number))
+        else:
+            raise ValueError(
+                "Table should be 'responses', 'emails' or 'phones'")
+
+    def to_arrow(self):
+        """
+        Build a `pyarrow.Table` with one row per response. Emails, phones,
+        company names and postal addresses become list columns sharing the
+        batch's offset buffers.
+        """
+        pyarrow = _import_pyarrow()
+        columns = {name: pyarrow.array(getattr(self, name), pyarrow.string())
+                   for name in ResponseBatch.SCALAR_COLUMNS}
+        columns['website_responded'] = pyarrow.Array.from_buffers(
+            pyarrow.int8(), len(self.website_responded),
+            [None, pyarrow.py_buffer(self.website_responded)]
+        ).cast(pyarrow.bool_())
+        columns['company_names'] = _list_array(
+            self.company_name_offsets,
+            pyarrow.array(self.company_names, pyarrow.string()))
+        columns['postal_addresses'] = _list_array(
+            self.postal_address_offsets,
+            pyarrow.array(self.postal_addresses, pyarrow.string()))
+        columns['emails'] = _list_array(
+            self.email_offsets, pyarrow.StructArray.from_arrays(
+                [pyarrow.array(self.email_description, pyarrow.string()),
+                 pyarrow.array(self.email_email, pyarrow.string())],
+                ResponseBatch.EMAIL_COLUMNS))
+        columns['phones'] = _list_array(
+            self.phone_offsets, pyarrow.StructArray.from_arrays(
+                [pyarrow.array(self.phone_call_hours, pyarrow.string()),
+                 pyarrow.array(self.phone_description, pyarrow.string()),
+                 pyarrow.array(self.phone_phone_number, pyarrow.string())],
+                ResponseBatch.PHONE_COLUMNS))
+        return pyarrow.table(columns)
+
+    def to_parquet(self, path, **kwargs):
+        """
+        Write the batch as a Parquet file. Keyword arguments are passed
+        to `pyarrow.parquet.write_table`.
+        """
+        _import_pyarrow().parquet.write_table(self.to_arrow(), path, **kwargs)
+
+    def _row_domains(self, offsets: array):
+        for i in range(len(self)):
+            domain = self.domain_name[i]
+            for _ in range(offsets[i + 1] - offsets[i]):
+                yield domain
+
+
+def _string(value) -> str:
+    return str(value) if value else ''
+
+
+def _list(value) -> list:
+    return value if type(value) is list else []
+
+
+def _extend(column: list, offsets: array, values):
+    values = _list(values)
+    column.extend(values)
+    offsets.append(offsets[-1] + len(values))
+
+
+def _slice(column: list, offsets: array, i: int) -> list:
+    return column[offsets[i]:offsets[i + 1]]
+
+
+def _list_array(offsets: array, values):
+    pyarrow = _import_pyarrow()
+    offsets = pyarrow.Array.from_buffers(
+        pyarrow.int64(), len(offsets), [None, pyarrow.py_buffer(offsets)])
+    return pyarrow.LargeListArray.from_arrays(offsets, values)
@@ -1,11 +1,6 @@
-import copy
 from datetime import datetime
 
 from .base import BaseModel
-import sys
-
-if sys.version_info < (3, 9):
-    import typing
 
 
 def _datetime_from_int(values: dict, key: str) -> datetime or None:
@@ -34,15 +29,14 @@ def _int_value(values: dict, key: str) -> int:
 
 def _list_value(values: dict, key: str) -> list:
     if key in values and type(values[key]) is list:
-        return copy.deepcopy(values[key])
+        return list(values[key])
     return []
 
 
-def _list_of_objects(values: dict, key: str, classname: str) -> list:
-    r = []
+def _raw_list(values: dict, key: str) -> list:
     if key in values and type(values[key]) is list:
-        r = [globals()[classname](x) for x in values[key]]
-    return r
+        return values[key]
+    return []
 
 
 def _bool_value(values: dict, key: str) -> bool:
@@ -52,6 +46,9 @@ def _bool_value(values: dict, key: str) -> bool:
 
 
 class Email(BaseModel):
+    __slots__ = ('description', 'email')
+    _fields = __slots__
+
     description: str
     email: str
 
@@ -66,6 +63,9 @@ class Email(BaseModel):
 
 
 class Phone(BaseModel):
+    __slots__ = ('call_hours', 'description', 'phone_number')
+    _fields = __slots__
+
     call_hours: str
     description: str
     phone_number: str
@@ -83,25 +83,37 @@ class Phone(BaseModel):
 
 
 class Response(BaseModel):
+    """
+    Website contacts.
+
+    `emails` and `phones` are decoded from the raw API values on first
+    access.
+    """
+    __slots__ = ('company_names', 'country_code', 'domain_name', '_emails',
+                 '_raw_emails', 'meta_description', 'meta_title', '_phones',
+                 '_raw_phones', 'postal_addresses', 'social_facebook',
+                 'social_instagram', 'social_linkedin', 'social_twitter',
+                 'website_responded')
+    _fields = ('company_names', 'country_code', 'domain_name', 'emails',
+               'meta_description', 'meta_title', 'phones',
+               'postal_addresses', 'social_facebook', 'social_instagram',
+               'social_linkedin', 'social_twitter', 'website_responded')
+
     company_names: [str]
     country_code: str
     domain_name: str
-    if sys.version_info < (3, 9):
-        emails: typing.List[Email]
-        phones: typing.List[Phone]
-    else:
-        emails: [Email]
-        phones: [Phone]
 
     def __init__(self, values):
         super().__init__()
         self.company_names = []
         self.country_code = ''
         self.domain_name = ''
-        self.emails = []
+        self._emails = []
+        self._raw_emails = None
         self.meta_description = ''
         self.meta_title = ''
-        self.phones = []
+        self._phones = []
+        self._raw_phones = None
         self.postal_addresses = []
         self.social_facebook = ''
         self.social_instagram = ''
@@ -113,10 +125,10 @@ class Response(BaseModel):
             self.company_names = _list_value(values, 'companyNames')
             self.country_code = _string_value(values, 'countryCode')
             self.domain_name = _string_value(values, 'domainName')
-            self.emails = _list_of_objects(values, 'emails', 'Email')
+            self._raw_emails = _raw_list(values, 'emails')
             self.meta_description = _string_value(values['meta'], 'description')
             self.meta_title = _string_value(values['meta'], 'title')
-            self.phones = _list_of_objects(values, 'phones', 'Phone')
+            self._raw_phones = _raw_list(values, 'phones')
             self.postal_addresses = _list_value(values, 'postalAddresses')
             social = values['socialLinks']
             if 'facebook' in social:
@@ -129,8 +141,35 @@ class Response(BaseModel):
                 self.social_twitter = _string_value(social, 'twitter')
             self.website_responded = _bool_value(values, 'websiteResponded')
 
+    @property
+    def emails(self) -> list:
+        if self._raw_emails is not None:
+            self._emails = [Email(x) for x in self._raw_emails]
+            self._raw_emails = None
+        return self._emails
+
+    @emails.setter
+    def emails(self, value: list):
+        self._emails = value
+        self._raw_emails = None
+
+    @property
+    def phones(self) -> list:
+        if self._raw_phones is not None:
+            self._phones = [Phone(x) for x in self._raw_phones]
+            self._raw_phones = None
+        return self._phones
+
+    @phones.setter
+    def phones(self, value: list):
+        self._phones = value
+        self._raw_phones = None
+
 
 class ErrorMessage(BaseModel):
+    __slots__ = ('code', 'message')
+    _fields = __slots__
+
     code: int
     message: str
 
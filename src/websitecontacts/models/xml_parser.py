@@ -0,0 +1,65 @@
+from xml.etree.ElementTree import XMLPullParser
+
+_LIST_KEYS = frozenset(['companyNames', 'emails', 'phones', 'postalAddresses'])
+_BOOL_KEYS = frozenset(['websiteResponded'])
+_CHUNK_SIZE = 16384
+
+
+def parse_xml(source) -> dict:
+    """
+    Incrementally parse an XML API response into the structure of the
+    JSON response, ready for `Response`.
+
+    Elements are converted and discarded as soon as they are closed, so
+    no document tree is kept in memory. Children of `companyNames`,
+    `emails`, `phones` and `postalAddresses` become list items whatever
+    their tag; other elements with children become dicts and leaf
+    elements become strings.
+
+    :param source: bytes or str with the whole body, or an iterable of
+        bytes/str chunks.
+    :return: dict
+    :raises xml.etree.ElementTree.ParseError: malformed XML
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, str)):
+        source = _chunks(source)
+
+    parser = XMLPullParser(events=('end',))
+    values = {}
+    result = None
+
+    for chunk in source:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            result = _convert(
+                element, [(child.tag, values.pop(child)) for child in element])
+            element.clear()
+            values[element] = result
+
+    parser.close()
+    if not isinstance(result, dict):
+        return {}
+    return result
+
+
+def _chunks(body, size: int = _CHUNK_SIZE):
+    # Feeding the body piecewise keeps the queue of parsed events short.
+    view = memoryview(body) if not isinstance(body, str) else body
+    for start in range(0, len(view), size):
+        yield view[start:start + size]
+
+
+def _convert(element, children: list):
+    if element.tag in _LIST_KEYS:
+        return [value for _, value in children]
+
+    if not children:
+        text = (element.text or '').strip()
+        if element.tag in _BOOL_KEYS:
+            return text.lower() in ('true', '1')
+        return text
+
+    result = {}
+    for tag, value in children:
+        result[tag] = value
+    return result
@@ -1,3 +1,11 @@
-__all__ = ['ApiRequester']
+__all__ = ['ApiRequester', 'AsyncApiRequester', 'RetryPolicy', 'HedgePolicy']
 
-from .http import ApiRequester
+from .._lazy import lazy_exports
+
+# requests and aiohttp are only loaded by the requester that needs them.
+__getattr__, __dir__ = lazy_exports(__name__, __all__, {
+    'ApiRequester': '.http',
+    'AsyncApiRequester': '.async_http',
+    'RetryPolicy': '.retry',
+    'HedgePolicy': '.hedge',
+})
@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+from .http import ApiRequester
+from ..version import VERSION, LIBRARY_NAME
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class AsyncApiRequester:
+    __connect_timeout = 10
+    __user_agent = "{name}/{ver}".format(name=LIBRARY_NAME, ver=VERSION)
+    _base_url: str
+    _timeout: float
+    _pool_size: int
+    _max_concurrency: int
+
+    def __init__(self, **kwargs):
+        """
+
+        :param kwargs: Supported parameters:
+        - base_url: (optional) API endpoint URL; str
+        - timeout: (optional) API call timeout in seconds; float
+        - pool_size: (optional) max number of keep-alive connections;
+            int, 100 by default
+        - max_concurrency: (optional) max number of requests in flight;
+            int, equal to pool_size by default
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncApiRequester requires aiohttp. "
+                "Install it with: pip install website-contacts[async]")
+
+        self._base_url = ''
+        self._session = None
+        self._semaphore = None
+        self.timeout = 30
+        self.pool_size = 100
+
+        if 'base_url' in kwargs:
+            self.base_url = kwargs['base_url']
+        if 'timeout' in kwargs:
+            self.timeout = kwargs['timeout']
+        if 'pool_size' in kwargs:
+            self.pool_size = kwargs['pool_size']
+
+        self.max_concurrency = kwargs.get('max_concurrency', self.pool_size)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, url: str):
+        if url is None or len(url) <= 8 or not url.startswith('http'):
+            raise ValueError("Invalid URL specified.")
+        self._base_url = url
+
+    @property
+    def timeout(self) -> float:
+        """API call timeout in seconds"""
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: float):
+        """API call timeout in seconds"""
+        if value is not None and 1 <= value <= 60:
+            self._timeout = value
+        else:
+            raise ValueError("Timeout value should be in [1, 60]")
+
+    @property
+    def pool_size(self) -> int:
+        """Max number of keep-alive connections"""
+        return self._pool_size
+
+    @pool_size.setter
+    def pool_size(self, value: int):
+        if self._session is not None:
+            raise ValueError("Pool size cannot be changed after first use")
+        if type(value) is int and 1 <= value <= 1000:
+            self._pool_size = value
+        else:
+            raise ValueError("Pool size should be an integer in [1, 1000]")
+
+    @property
+    def max_concurrency(self) -> int:
+        """Max number of requests in flight"""
+        return self._max_concurrency
+
+    @max_concurrency.setter
+    def max_concurrency(self, value: int):
+        if self._semaphore is not None:
+            raise ValueError(
+                "Max concurrency cannot be changed after first use")
+        if type(value) is int and value >= 1:
+            self._max_concurrency = value
+        else:
+            raise ValueError("Max concurrency should be a positive integer")
+
+    async def close(self):
+        """Close all pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(self, payload: dict) -> str:
+        return (await self.get_bytes(payload)).decode('UTF-8')
+
+    async def get_bytes(self, payload: dict) -> bytes:
+        headers = {
+            'User-Agent': AsyncApiRequester.__user_agent,
+        }
+        return await self._request('GET', params=payload, headers=headers)
+
+    async def post(self, data: dict) -> str:
+        return (await self.post_bytes(data)).decode('UTF-8')
+
+    async def post_bytes(self, data: dict) -> bytes:
+        headers = {
+            'User-Agent': AsyncApiRequester.__user_agent,
+        }
+        if 'apiKey' in data:
+            headers['X-Authentication-Token'] = data.pop('apiKey')
+
+        return await self._request('POST', json=data, headers=headers)
+
+    async def _request(self, method: str, **kwargs) -> bytes:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            session = self._get_session()
+            started = time.perf_counter()
+            async with session.request(
+                    method, self.base_url, **kwargs) as response:
+                content = await response.read()
+                if 200 <= response.status < 300:
+                    return content
+
+                ApiRequester._raise_for_status(
+                    response.status,
+                    content.decode('UTF-8', 'replace'),
+                    time.perf_counter() - started)
+
+    def _get_session(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            timeout = aiohttp.ClientTimeout(
+                connect=AsyncApiRequester.__connect_timeout,
+                sock_read=self.timeout)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=timeout)
+        return self._session
@@ -0,0 +1,351 @@
+from collections import deque
+import heapq
+import itertools
+import math
+import socket
+import threading
+import time
+
+from .timing import TimedHTTPAdapter, _TimedHTTPConnection, \
+    _TimedHTTPSConnection, _TimedHTTPConnectionPool, _TimedHTTPSConnectionPool
+
+# Cancellation handle of the request running on the current thread.
+_current = threading.local()
+
+
+class HedgePolicy:
+    """
+    When `ApiRequester` sends a backup copy of a slow call.
+
+    A call still unanswered after the `percentile` of the latencies of
+    the last `window` calls is sent again on another connection. The
+    first answer is used and the other request is cancelled by closing
+    its socket. Every call adds `budget` tokens to a bucket holding at
+    most `burst`, and every backup request takes one, so hedging adds
+    at most `budget` times the call volume.
+    """
+
+    def __init__(self, percentile: float = 95, window: int = 1000,
+                 min_samples: int = 20, min_delay: float = 0.01,
+                 budget: float = 0.05, burst: int = 10):
+        """
+        :param percentile: float: Latency percentile after which a call
+            is hedged, in (0, 100), 95 by default.
+        :param window: int: Number of recent latencies kept.
+        :param min_samples: int: Calls measured before hedging starts.
+        :param min_delay: float: Lower bound of the hedging delay.
+        :param budget: float: Backup requests allowed per call, 0.05 by
+            default.
+        :param burst: int: Max backup requests sent back to back.
+        """
+        if percentile is None or not 0 < percentile < 100:
+            raise ValueError("Percentile should be in (0, 100)")
+        if type(window) is not int or window < 1:
+            raise ValueError("Window should be a positive integer")
+        if type(min_samples) is not int or not 1 <= min_samples <= window:
+            raise ValueError("Min samples should be in [1, window]")
+        if min_delay is None or min_delay < 0:
+            raise ValueError("Min delay should not be negative")
+        if budget is None or not 0 < budget <= 1:
+            raise ValueError("Budget should be in (0, 1]")
+        if type(burst) is not int or burst < 1:
+            raise ValueError("Burst should be a positive integer")
+
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.budget = budget
+        self.burst = burst
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._delay = None
+        self._update_every = max(1, window // 20)
+        self._pending = 0
+        self._tokens = 0.0
+        self._hedged = 0
+        self._wins = 0
+        self._denied = 0
+
+    def delay(self) -> float or None:
+        """
+        Seconds to wait for an answer before hedging a call, None while
+        fewer than `min_samples` calls were measured. Updated every
+        `window / 20` calls to keep sorting off the call path.
+        """
+        return self._delay
+
+    def record(self, latency: float):
+        """Add the latency of a finished call and its hedging budget."""
+        with self._lock:
+            self._latencies.append(latency)
+            self._tokens = min(self.burst, self._tokens + self.budget)
+            self._pending += 1
+            if len(self._latencies) < self.min_samples or (
+                    self._delay is not None
+                    and self._pending < self._update_every):
+                return
+            self._pending = 0
+            latencies = list(self._latencies)
+
+        # Sorted outside the lock, other calls only wait for the copy.
+        latencies.sort()
+        rank = math.ceil(self.percentile / 100 * len(latencies))
+        self._delay = max(self.min_delay, latencies[rank - 1])
+
+    def acquire(self) -> bool:
+        """Take a token for a backup request if the budget allows one."""
+        with self._lock:
+            if self._tokens < 1:
+                self._denied += 1
+                return False
+            self._tokens -= 1
+            self._hedged += 1
+            return True
+
+    def stats(self) -> dict:
+        """
+        Counters: backup requests sent (`hedged`), answered first
+        (`wins`) and refused by the budget (`denied`)
+        """
+        with self._lock:
+            return {
+                'hedged': self._hedged,
+                'wins': self._wins,
+                'denied': self._denied,
+            }
+
+    def _count_win(self):
+        with self._lock:
+            self._wins += 1
+
+
+def send_hedged(policy: HedgePolicy, send):
+    """
+    Call `send()` and, when it is slower than the policy's delay, a
+    second copy of it on another thread.
+
+    :return: the first response received; the other request is
+        cancelled
+    :raises: the error of the first call if no call got a response
+    """
+    delay = policy.delay()
+    started = time.monotonic()
+    if delay is None:
+        response = send()
+        policy.record(time.monotonic() - started)
+        return response
+
+    race = _Race(policy, send)
+    _timer.schedule(started + delay, race)
+    _current.cancellation = race.primary
+    try:
+        response = send()
+    except Exception as error:
+        return race.finish(None, error, started)
+    finally:
+        _current.cancellation = None
+    return race.finish(response, None, started)
+
+
+class _Timer:
+    """
+    One thread waiting for the hedging delays of all calls. Backup
+    requests get a thread of their own only once they are sent.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._heap = []
+        self._sequence = itertools.count()
+        self._thread = None
+
+    def schedule(self, deadline: float, race: '_Race'):
+        with self._condition:
+            heapq.heappush(self._heap, (deadline, next(self._sequence), race))
+            # Not alive either in a child process forked after its start.
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            elif self._heap[0][2] is race:
+                self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    now = time.monotonic()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    self._condition.wait(
+                        self._heap[0][0] - now if self._heap else None)
+                race = heapq.heappop(self._heap)[2]
+            race.start_backup()
+
+
+_timer = _Timer()
+
+
+class _Race:
+    _PRIMARY = 'primary'
+    _BACKUP = 'backup'
+
+    def __init__(self, policy: HedgePolicy, send):
+        self.primary = _Cancellation()
+        self._backup = _Cancellation()
+        self._policy = policy
+        self._send = send
+        self._lock = threading.Lock()
+        self._primary_done = False
+        self._backup_done = None
+        self._backup_started = False
+        self._winner = None
+        self._response = None
+
+    def finish(self, response, error: Exception or None, started: float):
+        """Settle the race once the primary call has returned or failed."""
+        with self._lock:
+            self._primary_done = True
+            if response is not None and self._winner is None:
+                self._winner = _Race._PRIMARY
+            backup_started = self._backup_started
+
+        if self._winner == _Race._PRIMARY:
+            if backup_started:
+                self._backup.cancel()
+            self._policy.record(time.monotonic() - started)
+            return response
+
+        if response is not None:
+            # Answered just after losing.
+            response.close()
+        if backup_started:
+            self._backup_done.wait()
+        if self._winner == _Race._BACKUP:
+            # The primary was cancelled: its latency is at least this.
+            self._policy.record(time.monotonic() - started)
+            return self._response
+        raise error
+
+    def start_backup(self):
+        """Send the backup request unless the primary call is done."""
+        with self._lock:
+            if self._primary_done or not self._policy.acquire():
+                return
+            self._backup_started = True
+            self._backup_done = threading.Event()
+        threading.Thread(target=self._run_backup, daemon=True).start()
+
+    def _run_backup(self):
+        response = None
+        _current.cancellation = self._backup
+        try:
+            response = self._send()
+        except Exception:
+            pass
+        finally:
+            _current.cancellation = None
+
+        with self._lock:
+            won = response is not None and self._winner is None
+            if won:
+                self._winner = _Race._BACKUP
+                self._response = response
+            self._backup_done.set()
+
+        if won:
+            self._policy._count_win()
+            self.primary.cancel()
+        elif response is not None:
+            response.close()
+
+
+class _Cancellation:
+    """Lets another thread abort a request by shutting down its socket."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._connection = None
+
+    def attach(self, connection):
+        with self._lock:
+            self._connection = connection
+            cancelled = self._cancelled
+        if cancelled:
+            _shutdown(connection)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+            connection = self._connection
+        if connection is not None:
+            _shutdown(connection)
+
+
+def cancelled() -> bool:
+    """Whether the request running on this thread lost a hedging race."""
+    cancellation = getattr(_current, 'cancellation', None)
+    return cancellation is not None and cancellation.cancelled
+
+
+def _shutdown(connection):
+    sock = getattr(connection, 'sock', None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def _attach(connection):
+    cancellation = getattr(_current, 'cancellation', None)
+    if cancellation is not None:
+        cancellation.attach(connection)
+
+
+class _CancellableConnect:
+    def connect(self):
+        super().connect()
+        # A request cancelled while connecting is aborted now.
+        _attach(self)
+
+
+class _CancellableHTTPConnection(_CancellableConnect, _TimedHTTPConnection):
+    pass
+
+
+class _CancellableHTTPSConnection(_CancellableConnect, _TimedHTTPSConnection):
+    pass
+
+
+class _CancellablePool:
+    def _get_conn(self, timeout=None):
+        connection = super()._get_conn(timeout)
+        _attach(connection)
+        return connection
+
+
+class _CancellableHTTPConnectionPool(_CancellablePool,
+                                     _TimedHTTPConnectionPool):
+    ConnectionCls = _CancellableHTTPConnection
+
+
+class _CancellableHTTPSConnectionPool(_CancellablePool,
+                                      _TimedHTTPSConnectionPool):
+    ConnectionCls = _CancellableHTTPSConnection
+
+
+class CancellableHTTPAdapter(TimedHTTPAdapter):
+    """TimedHTTPAdapter whose requests can be cancelled by `hedge`."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CancellableHTTPConnectionPool,
+            'https': _CancellableHTTPSConnectionPool,
+        }
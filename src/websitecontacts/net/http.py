@@ -1,15 +1,39 @@
-from requests import request, Response
-from ..exceptions.error import ApiAuthError, HttpApiError, BadRequestError
+from requests import request, Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from .hedge import CancellableHTTPAdapter, HedgePolicy, send_hedged, \
+    cancelled
+from .retry import RetryPolicy
+from .throttle import TokenBucket, ConcurrencyLimiter
+from .timing import TimedHTTPAdapter, set_current
+from ..instrumentation import Instrumentation
+from ..exceptions.error import ApiAuthError, HttpApiError, BadRequestError, \
+    ResponseTooLargeError, WebsiteContactsApiError
 from ..version import VERSION, LIBRARY_NAME
 import logging
+import threading
+import time
 
 
 class ApiRequester:
     __logger = logging.getLogger("api-requester")
     __connect_timeout = 10
     __user_agent = "{name}/{ver}".format(name=LIBRARY_NAME, ver=VERSION)
+    # gzip and deflate, plus br when brotli is installed. urllib3
+    # decompresses while the body is read.
+    __read_chunk_size = 65536
+    __accept_encoding = make_headers(accept_encoding=True)['accept-encoding']
     _base_url: str
     _timeout: float
+    _pooled: bool
+    _pool_size: int
+    _pool_idle_timeout: float
+    _session: Session or None
+    _rate_limiter: TokenBucket or None
+    _concurrency_limiter: ConcurrencyLimiter or None
+    _retry: RetryPolicy or None
+    _hedge: HedgePolicy or None
+    _instrumentation: Instrumentation or None
 
     def __init__(self, **kwargs):
         """
@@ -17,14 +41,75 @@ class ApiRequester:
         :param kwargs: Supported parameters:
         - base_url: (optional) API endpoint URL; str
         - timeout: (optional) API call timeout in seconds; float
+        - pooled: (optional) reuse keep-alive connections between calls;
+            bool, False by default
+        - pool_size: (optional) max number of connections kept open
+            in pooled mode; int, 10 by default
+        - pool_idle_timeout: (optional) seconds after which an unused
+            connection pool is closed; float, 60 by default
+        - rate_limit: (optional) max requests per second shared by all
+            threads; float
+        - rate_burst: (optional) max requests sent back to back under
+            rate_limit; int
+        - max_concurrency: (optional) max requests in flight; int
+        - adaptive_concurrency: (optional) lower max_concurrency on
+            429/5xx answers and latency spikes and raise it back while
+            responses are healthy; bool, False by default
+        - retry: (optional) retry policy for failed calls; RetryPolicy
+        - hedge: (optional) send a backup request when a call is slower
+            than most recent ones and use the first answer; HedgePolicy
+        - instrumentation: (optional) timing hooks; Instrumentation
+        - max_response_size: (optional) max body size in bytes. Bodies
+            are then read into a buffer reused by each thread, grown
+            as needed up to this size, and larger ones are aborted with
+            ResponseTooLargeError; int, unlimited by default
         """
         self._base_url = ''
+        self._session = None
+        self._instrumentation = kwargs.get('instrumentation')
+        self._session_lock = threading.Lock()
+        self._in_flight = 0
+        self._last_used = 0.0
+        self._buffers = threading.local()
         self.timeout = 30
+        self.pooled = False
+        self.pool_size = 10
+        self.pool_idle_timeout = 60
 
         if 'base_url' in kwargs:
             self.base_url = kwargs['base_url']
         if 'timeout' in kwargs:
             self.timeout = kwargs['timeout']
+        if 'pooled' in kwargs:
+            self.pooled = kwargs['pooled']
+        if 'pool_size' in kwargs:
+            self.pool_size = kwargs['pool_size']
+        if 'pool_idle_timeout' in kwargs:
+            self.pool_idle_timeout = kwargs['pool_idle_timeout']
+
+        self.retry = kwargs.get('retry')
+        self.hedge = kwargs.get('hedge')
+        self.max_response_size = kwargs.get('max_response_size')
+
+        self._rate_limiter = None
+        if kwargs.get('rate_limit') is not None:
+            self._rate_limiter = TokenBucket(
+                kwargs['rate_limit'], kwargs.get('rate_burst'))
+
+        self._concurrency_limiter = None
+        if kwargs.get('max_concurrency') is not None:
+            self._concurrency_limiter = ConcurrencyLimiter(
+                kwargs['max_concurrency'],
+                kwargs.get('adaptive_concurrency', False))
+        elif kwargs.get('adaptive_concurrency'):
+            raise ValueError(
+                "Adaptive concurrency requires max_concurrency")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     @property
     def base_url(self) -> str:
@@ -49,49 +134,426 @@ class ApiRequester:
         else:
             raise ValueError("Timeout value should be in [1, 60]")
 
+    @property
+    def pooled(self) -> bool:
+        """Whether keep-alive connections are reused between calls"""
+        return self._pooled
+
+    @pooled.setter
+    def pooled(self, value: bool):
+        self._pooled = bool(value)
+        if not self._pooled:
+            self.close()
+
+    @property
+    def pool_size(self) -> int:
+        """Max number of connections kept open in pooled mode"""
+        return self._pool_size
+
+    @pool_size.setter
+    def pool_size(self, value: int):
+        if type(value) is int and 1 <= value <= 1000:
+            self._pool_size = value
+            self.close()
+        else:
+            raise ValueError("Pool size should be an integer in [1, 1000]")
+
+    @property
+    def pool_idle_timeout(self) -> float:
+        """Seconds after which an unused connection pool is closed"""
+        return self._pool_idle_timeout
+
+    @pool_idle_timeout.setter
+    def pool_idle_timeout(self, value: float):
+        if value is not None and value > 0:
+            self._pool_idle_timeout = value
+        else:
+            raise ValueError("Pool idle timeout should be positive")
+
+    @property
+    def retry(self) -> RetryPolicy or None:
+        return self._retry
+
+    @retry.setter
+    def retry(self, value: RetryPolicy or None):
+        if value is None or isinstance(value, RetryPolicy):
+            self._retry = value
+        else:
+            raise ValueError(
+                "Value should be an instance of "
+                "websitecontacts.RetryPolicy or None")
+
+    @property
+    def hedge(self) -> HedgePolicy or None:
+        return self._hedge
+
+    @hedge.setter
+    def hedge(self, value: HedgePolicy or None):
+        if value is None or isinstance(value, HedgePolicy):
+            self._hedge = value
+            # Hedged requests need connections they can be cancelled on.
+            self.close()
+        else:
+            raise ValueError(
+                "Value should be an instance of "
+                "websitecontacts.HedgePolicy or None")
+
+    @property
+    def max_response_size(self) -> int or None:
+        """Max response body size in bytes, None for unlimited"""
+        return self._max_response_size
+
+    @max_response_size.setter
+    def max_response_size(self, value: int or None):
+        if value is None or (type(value) is int and value > 0):
+            self._max_response_size = value
+        else:
+            raise ValueError(
+                "Max response size should be a positive integer or None")
+
+    @property
+    def instrumentation(self) -> Instrumentation or None:
+        return self._instrumentation
+
+    @property
+    def rate_limiter(self) -> TokenBucket or None:
+        return self._rate_limiter
+
+    @property
+    def concurrency_limiter(self) -> ConcurrencyLimiter or None:
+        return self._concurrency_limiter
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
     def get(self, payload: dict) -> str:
-        headers = {
-            'User-Agent': ApiRequester.__user_agent,
-            'Connection': 'close'
-        }
-        response = request(
+        return self.get_bytes(payload).decode('UTF-8')
+
+    def get_bytes(self, payload: dict) -> bytes:
+        return bytes(ApiRequester._handle_response(*self._get(payload, {})))
+
+    def get_view(self, payload: dict) -> memoryview:
+        """
+        Like `get_bytes`, but without copying the body out of the
+        thread's read buffer when `max_response_size` is set. The view
+        is only valid until the next call made by the same thread.
+        """
+        return memoryview(
+            ApiRequester._handle_response(*self._get(payload, {})))
+
+    def get_conditional(self, payload: dict, etag: str = None,
+                        last_modified: str = None) -> tuple:
+        """
+        Like `get_bytes`, but lets the API answer 304 Not Modified when
+        the response identified by `etag` or `last_modified` is still
+        current.
+
+        :return: (response bytes or None if not modified, ETag,
+            Last-Modified); the validators are None if the API sent none
+        """
+        headers = {}
+        if etag is not None:
+            headers['If-None-Match'] = etag
+        if last_modified is not None:
+            headers['If-Modified-Since'] = last_modified
+
+        # Without validators a 304 answer can't be served from the cache.
+        conditional = bool(headers)
+        response, latency = self._get(payload, headers)
+        content = ApiRequester._handle_response(
+            response, latency, conditional)
+        if content is None:
+            # Still current, a 304 may omit the validators.
+            return (None, response.headers.get('ETag', etag),
+                    response.headers.get('Last-Modified', last_modified))
+        # A new body only comes with its own validators.
+        return (bytes(content), response.headers.get('ETag'),
+                response.headers.get('Last-Modified'))
+
+    def _get(self, payload: dict, headers: dict) -> tuple:
+        headers['User-Agent'] = ApiRequester.__user_agent
+        headers['Accept-Encoding'] = ApiRequester.__accept_encoding
+        started = time.perf_counter()
+        response = self._request(
             "GET",
-            self.base_url,
             params=payload,
-            headers=headers,
-            timeout=(ApiRequester.__connect_timeout, self.timeout)
+            headers=headers
         )
+        latency = time.perf_counter() - started
+        if self._instrumentation is not None:
+            self._instrumentation.timing(Instrumentation.REQUEST, latency)
 
-        return ApiRequester._handle_response(response)
+        return response, latency
 
     def post(self, data: dict) -> str:
+        return self.post_bytes(data).decode('UTF-8')
+
+    def post_bytes(self, data: dict) -> bytes:
         headers = {
             'User-Agent': ApiRequester.__user_agent,
-            'Connection': 'close'
+            'Accept-Encoding': ApiRequester.__accept_encoding,
         }
         if 'apiKey' in data:
             headers['X-Authentication-Token'] = data.pop('apiKey')
 
-        response = request(
+        started = time.perf_counter()
+        response = self._request(
             'POST',
-            self.base_url,
             json=data,
-            headers=headers,
-            timeout=(ApiRequester.__connect_timeout, self.timeout)
+            headers=headers
         )
+        latency = time.perf_counter() - started
+        if self._instrumentation is not None:
+            self._instrumentation.timing(Instrumentation.REQUEST, latency)
+
+        return bytes(ApiRequester._handle_response(response, latency))
+
+    def _request(self, method: str, **kwargs) -> Response:
+        send = self._attempt if self._hedge is None else self._hedged
+        policy = self._retry
+        if policy is None:
+            return send(method, self.timeout, **kwargs)
+
+        deadline = None
+        if policy.deadline is not None:
+            deadline = time.monotonic() + policy.deadline
+
+        attempt = 1
+        read_timeout = self.timeout
+        if deadline is not None:
+            read_timeout = min(read_timeout, policy.deadline)
+        while True:
+            response = None
+            try:
+                response = send(method, read_timeout, **kwargs)
+            except policy.retry_exceptions as error:
+                if attempt >= policy.max_attempts:
+                    raise
+                delay = policy.delay(attempt)
+                if deadline is not None \
+                        and time.monotonic() + delay >= deadline:
+                    raise
+                failure = error
+            else:
+                if response.status_code not in policy.retry_statuses \
+                        or attempt >= policy.max_attempts:
+                    return response
+                delay = policy.delay(
+                    attempt, response.headers.get('Retry-After'))
+                if deadline is not None \
+                        and time.monotonic() + delay >= deadline:
+                    return response
+                failure = None
+
+            ApiRequester.__logger.debug(
+                "Attempt %d failed, retrying in %.2f s", attempt, delay)
+            time.sleep(delay)
+            attempt += 1
+
+            if deadline is not None:
+                # sleep() may overshoot the deadline.
+                read_timeout = min(self.timeout, deadline - time.monotonic())
+                if read_timeout <= 0:
+                    if failure is not None:
+                        raise failure
+                    return response
+
+    def _hedged(self, method: str, read_timeout: float,
+                **kwargs) -> Response:
+        return send_hedged(self._hedge, lambda: self._attempt(
+            method, read_timeout, **kwargs))
+
+    def _attempt(self, method: str, read_timeout: float,
+                 **kwargs) -> Response:
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+
+        if self._concurrency_limiter is None:
+            return self._send(method, read_timeout, **kwargs)
+
+        generation = self._concurrency_limiter.acquire()
+        started = time.monotonic()
+        status_code = None
+        try:
+            response = self._send(method, read_timeout, **kwargs)
+            status_code = response.status_code
+            return response
+        finally:
+            # A request cancelled by hedging says nothing about load.
+            self._concurrency_limiter.release(
+                time.monotonic() - started, status_code, cancelled(),
+                generation)
+
+    def _send(self, method: str, read_timeout: float,
+              **kwargs) -> Response:
+        kwargs['timeout'] = (
+            min(ApiRequester.__connect_timeout, read_timeout), read_timeout)
+        plain = self._instrumentation is None \
+            and self._max_response_size is None and self._hedge is None
+
+        if not self.pooled:
+            kwargs['headers']['Connection'] = 'close'
+            if plain:
+                return request(method, self.base_url, **kwargs)
+            with self._new_session(1) as session:
+                return self._read_request(session, method, **kwargs)
 
-        return ApiRequester._handle_response(response)
+        session = self._acquire_session()
+        try:
+            if plain:
+                return session.request(method, self.base_url, **kwargs)
+            return self._read_request(session, method, **kwargs)
+        finally:
+            self._release_session()
+
+    def _read_request(self, session: Session, method: str,
+                      **kwargs) -> Response:
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            set_current(instrumentation)
+        try:
+            started = time.perf_counter()
+            response = session.request(
+                method, self.base_url, stream=True, **kwargs)
+            headers_received = time.perf_counter()
+            if self._max_response_size is None:
+                response.content
+            else:
+                response.raw_view = self._read_into_buffer(response)
+            finished = time.perf_counter()
+        finally:
+            if instrumentation is not None:
+                set_current(None)
+
+        if instrumentation is not None:
+            instrumentation.timing(
+                Instrumentation.TIME_TO_FIRST_BYTE, headers_received - started)
+            instrumentation.timing(
+                Instrumentation.BODY_READ, finished - headers_received)
+        return response
+
+    def _read_into_buffer(self, response: Response) -> memoryview:
+        limit = self._max_response_size
+        length = response.headers.get('Content-Length')
+        # A compressed body may still fit once decoded.
+        if length is not None and 'Content-Encoding' not in response.headers \
+                and int(length) > limit:
+            response.close()
+            raise ResponseTooLargeError(
+                "Response body of {} bytes exceeds max_response_size".format(
+                    length), response.status_code)
+
+        # bytearray() zero-fills its memory, so the buffer starts at the
+        # expected body size and only grows towards the limit as needed.
+        if length is not None and 'Content-Encoding' not in response.headers:
+            expected = int(length)
+        else:
+            expected = ApiRequester.__read_chunk_size
+        buffer = getattr(self._buffers, 'buffer', None)
+        if buffer is None or len(buffer) > limit:
+            buffer = self._buffers.buffer = bytearray(
+                max(1, min(expected, limit)))
+        view = memoryview(buffer)
+
+        size = 0
+        for chunk in response.raw.stream(
+                ApiRequester.__read_chunk_size, decode_content=True):
+            end = size + len(chunk)
+            if end > limit:
+                response.close()
+                raise ResponseTooLargeError(
+                    "Response body exceeds max_response_size",
+                    response.status_code)
+            if end > len(buffer):
+                grown = bytearray(min(limit, max(end, 2 * len(buffer))))
+                grown[:size] = view[:size]
+                view.release()
+                buffer = self._buffers.buffer = grown
+                view = memoryview(buffer)
+            view[size:end] = chunk
+            size = end
+        return view[:size]
+
+    def _acquire_session(self) -> Session:
+        with self._session_lock:
+            now = time.monotonic()
+            if self._session is not None and self._in_flight == 0 \
+                    and now - self._last_used > self.pool_idle_timeout:
+                ApiRequester.__logger.debug("Closing idle connection pool")
+                self._session.close()
+                self._session = None
+
+            if self._session is None:
+                self._session = self._new_session(self.pool_size)
+
+            self._in_flight += 1
+            self._last_used = now
+            return self._session
+
+    def _release_session(self):
+        with self._session_lock:
+            self._in_flight -= 1
+            self._last_used = time.monotonic()
+
+    def _new_session(self, pool_size: int) -> Session:
+        return ApiRequester._create_session(
+            pool_size, self._instrumentation is not None,
+            self._hedge is not None)
 
     @staticmethod
-    def _handle_response(response: Response) -> str:
+    def _create_session(pool_size: int, timed: bool = False,
+                        cancellable: bool = False) -> Session:
+        session = Session()
+        if cancellable:
+            adapter_class = CancellableHTTPAdapter
+        else:
+            adapter_class = TimedHTTPAdapter if timed else HTTPAdapter
+        adapter = adapter_class(pool_connections=1, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @staticmethod
+    def _handle_response(response: Response,
+                         latency: float or None = None,
+                         conditional: bool = False
+                         ) -> bytes or memoryview or None:
+        # Bodies read into the reusable buffer come as a memoryview.
+        content = getattr(response, 'raw_view', None)
+        if content is None:
+            content = response.content
+
         if 200 <= response.status_code < 300:
-            return response.content.decode('UTF-8')
+            return content
 
-        if response.status_code in [401, 402, 403]:
-            raise ApiAuthError(response.text)
+        if response.status_code == 304 and conditional:
+            return None
+
+        # Not response.text: guessing the encoding of every error body
+        # costs more than the rest of the error path.
+        ApiRequester._raise_for_status(
+            response.status_code,
+            bytes(content).decode('UTF-8', 'replace'),
+            latency)
+
+    @staticmethod
+    def _raise_for_status(status_code: int, text: str,
+                          latency: float or None = None):
+        if status_code >= 300:
+            raise ApiRequester._error_for_status(status_code, text, latency)
+
+    @staticmethod
+    def _error_for_status(
+            status_code: int, text: str,
+            latency: float or None = None) -> WebsiteContactsApiError:
+        if status_code in [401, 402, 403]:
+            return ApiAuthError(text, status_code, latency)
 
-        if response.status_code in [400, 422]:
-            raise BadRequestError(response.text)
+        if status_code in [400, 422]:
+            return BadRequestError(text, status_code, latency)
 
-        if response.status_code >= 300:
-            raise HttpApiError(response.text)
+        return HttpApiError(text, status_code, latency)
@@ -0,0 +1,83 @@
+from email.utils import parsedate_to_datetime
+import datetime
+import random
+
+from requests.exceptions import ConnectionError, Timeout
+
+
+class RetryPolicy:
+    """
+    When and how `ApiRequester` retries a failed call.
+
+    Delays grow exponentially from `backoff` up to `max_backoff` with
+    full jitter. A `Retry-After` header overrides the computed delay,
+    still capped at `max_backoff`.
+    Authentication and bad request answers (400, 401, 402, 403, 422)
+    are never retried.
+    """
+    NEVER_RETRY_STATUSES = frozenset([400, 401, 402, 403, 422])
+
+    def __init__(self, max_attempts: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 30, jitter: bool = True,
+                 retry_statuses=(429, 500, 502, 503, 504),
+                 retry_exceptions=(ConnectionError, Timeout),
+                 deadline: float = None):
+        """
+        :param max_attempts: int: Total number of attempts, 3 by default.
+        :param backoff: float: Delay before the first retry in seconds.
+        :param max_backoff: float: Upper bound of a single delay.
+        :param jitter: bool: Randomize delays in [0, delay].
+        :param retry_statuses: HTTP status codes worth retrying.
+        :param retry_exceptions: Exception classes worth retrying.
+        :param deadline: float: (optional) Max seconds spent on a call,
+            all attempts and delays included.
+        """
+        if type(max_attempts) is not int or max_attempts < 1:
+            raise ValueError("Max attempts should be a positive integer")
+        if backoff is None or backoff < 0 or max_backoff < backoff:
+            raise ValueError("Backoff should be in [0, max_backoff]")
+        if deadline is not None and deadline <= 0:
+            raise ValueError("Deadline should be positive")
+
+        statuses = frozenset(retry_statuses)
+        if statuses & RetryPolicy.NEVER_RETRY_STATUSES:
+            raise ValueError(
+                "Authentication and bad request errors can't be retried")
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = statuses
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.deadline = deadline
+
+    def delay(self, attempt: int, retry_after: str = None) -> float:
+        """
+        Seconds to wait after the given (1-based) failed attempt.
+        """
+        if retry_after is not None:
+            parsed = RetryPolicy._parse_retry_after(retry_after)
+            if parsed is not None:
+                return min(parsed, self.max_backoff)
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(value: str) -> float or None:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if moment.tzinfo is None:
+            # Dates with a -0000 offset are parsed as naive UTC.
+            moment = moment.replace(tzinfo=datetime.timezone.utc)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max(0.0, (moment - now).total_seconds())
@@ -0,0 +1,160 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are added at `rate` per second up to `burst`; every request
+    takes one token and waits when the bucket is empty.
+    """
+    _rate: float
+    _burst: int
+
+    def __init__(self, rate: float, burst: int = None):
+        """
+        :param rate: float: Sustained requests per second.
+        :param burst: int: (optional) Max requests sent back to back,
+            defaults to max(1, rate).
+        """
+        if rate is None or rate <= 0:
+            raise ValueError("Rate should be positive")
+        if burst is None:
+            burst = max(1, int(rate))
+        if type(burst) is not int or burst < 1:
+            raise ValueError("Burst should be a positive integer")
+
+        self._rate = float(rate)
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        return self._burst
+
+    def acquire(self):
+        """Take one token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._burst,
+                    self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of requests in flight.
+
+    In adaptive mode the cap follows AIMD: it grows by one request per
+    window of healthy responses and is multiplied by `backoff` after
+    a 429/5xx answer, a connection error or a latency spike (a call
+    slower than `latency_factor` times the smoothed latency). Requests
+    sent before the last decrease don't decrease the limit again, so
+    a burst of failures halves it once rather than once per request.
+    """
+    _max_limit: int
+    _adaptive: bool
+
+    def __init__(self, max_limit: int, adaptive: bool = False,
+                 min_limit: int = 1, backoff: float = 0.5,
+                 latency_factor: float = 3.0):
+        """
+        :param max_limit: int: Max number of requests in flight.
+        :param adaptive: bool: (optional) Adjust the limit between
+            `min_limit` and `max_limit` using AIMD, False by default.
+        :param min_limit: int: (optional) Lowest adaptive limit.
+        :param backoff: float: (optional) Multiplicative decrease factor.
+        :param latency_factor: float: (optional) Latency spike threshold
+            relative to the smoothed latency.
+        """
+        if type(max_limit) is not int or max_limit < 1:
+            raise ValueError("Max concurrency should be a positive integer")
+        if type(min_limit) is not int or not 1 <= min_limit <= max_limit:
+            raise ValueError(
+                "Min concurrency should be an integer in [1, max_limit]")
+        if not 0 < backoff < 1:
+            raise ValueError("Backoff should be in (0, 1)")
+
+        self._max_limit = max_limit
+        self._min_limit = min_limit
+        self._adaptive = bool(adaptive)
+        self._backoff = backoff
+        self._latency_factor = latency_factor
+        self._limit = float(max_limit)
+        self._in_flight = 0
+        self._latency = None
+        self._generation = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> int:
+        """
+        Wait for a free slot.
+
+        :return: the number of decreases so far, to pass to `release`
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            return self._generation
+
+    def release(self, latency: float, status_code: int or None,
+                cancelled: bool = False, generation: int = None):
+        """
+        :param latency: float: Seconds the request took.
+        :param status_code: int or None: HTTP status, None when
+            the request failed without a response.
+        :param cancelled: bool: The request was aborted by the client,
+            so it doesn't adjust the adaptive limit.
+        :param generation: int: (optional) Value returned by `acquire`;
+            overload seen by a request sent before the last decrease
+            is ignored.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if self._adaptive and not cancelled:
+                self._adjust(latency, status_code, generation)
+            self._condition.notify_all()
+
+    def _adjust(self, latency: float, status_code: int or None,
+                generation: int or None):
+        overloaded = status_code is None or status_code == 429 \
+            or status_code >= 500
+        if not overloaded and self._latency is not None:
+            overloaded = latency > self._latency * self._latency_factor
+
+        if overloaded:
+            if generation is None or generation == self._generation:
+                self._limit = max(self._min_limit,
+                                  self._limit * self._backoff)
+                self._generation += 1
+            return
+
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency = 0.9 * self._latency + 0.1 * latency
+        self._limit = min(self._max_limit, self._limit + 1 / self._limit)
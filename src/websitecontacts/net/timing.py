@@ -0,0 +1,53 @@
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ..instrumentation import Instrumentation
+
+# Instrumentation of the request running on the current thread.
+_current = threading.local()
+
+
+def set_current(instrumentation):
+    _current.instrumentation = instrumentation
+
+
+class _TimedConnect:
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        instrumentation = getattr(_current, 'instrumentation', None)
+        if instrumentation is not None:
+            # DNS lookup, TCP connect and TLS handshake.
+            instrumentation.timing(Instrumentation.CONNECT,
+                                   time.perf_counter() - started)
+
+
+class _TimedHTTPConnection(_TimedConnect, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnect, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter reporting connection setup time to instrumentation."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
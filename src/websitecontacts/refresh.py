@@ -0,0 +1,148 @@
+import heapq
+import itertools
+import threading
+
+
+class RefreshScheduler:
+    """
+    Bounded pool of background threads running refresh jobs.
+
+    Jobs are identified by a key. A job whose key is already queued or
+    running is dropped as a duplicate; if it has a higher priority, the
+    queued job moves up instead. Queued jobs run highest priority first,
+    and new jobs are rejected once `max_queue` jobs are waiting.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 10000):
+        """
+        :param workers: int: Number of worker threads, 2 by default.
+        :param max_queue: int: Max number of waiting jobs,
+            10000 by default.
+        """
+        if type(workers) is not int or workers < 1:
+            raise ValueError("Workers should be a positive integer")
+        if type(max_queue) is not int or max_queue < 1:
+            raise ValueError("Max queue should be a positive integer")
+
+        self._workers = workers
+        self._max_queue = max_queue
+        self._condition = threading.Condition()
+        self._heap = []
+        self._queued = {}
+        self._running = set()
+        self._threads = []
+        self._sequence = itertools.count()
+        self._closed = False
+        self._scheduled = 0
+        self._deduplicated = 0
+        self._dropped = 0
+        self._completed = 0
+        self._failed = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return len(self._queued)
+
+    @property
+    def running(self) -> int:
+        """Number of jobs being run"""
+        return len(self._running)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                'queue_depth': len(self._queued),
+                'running': len(self._running),
+                'scheduled': self._scheduled,
+                'deduplicated': self._deduplicated,
+                'dropped': self._dropped,
+                'completed': self._completed,
+                'failed': self._failed,
+            }
+
+    def schedule(self, key, func, priority: float = 0) -> bool:
+        """
+        Queue `func()` to run in the background.
+
+        :param key: Hashable job identifier used for deduplication.
+        :param func: Callable without arguments.
+        :param priority: float: Jobs with higher values run first.
+        :return: True if a new job was queued
+        """
+        with self._condition:
+            if self._closed:
+                return False
+
+            if key in self._queued or key in self._running:
+                self._deduplicated += 1
+                queued = self._queued.get(key)
+                if queued is not None and priority > queued[0]:
+                    self._push(key, func, priority)
+                return False
+
+            if len(self._queued) >= self._max_queue:
+                self._dropped += 1
+                return False
+
+            self._push(key, func, priority)
+            self._scheduled += 1
+            if len(self._threads) < self._workers:
+                thread = threading.Thread(target=self._work, daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._condition.notify()
+            return True
+
+    def close(self, wait: bool = False):
+        """
+        Drop waiting jobs and stop the workers once their current job
+        is done.
+
+        :param wait: bool: Block until the workers have stopped.
+        """
+        with self._condition:
+            self._closed = True
+            self._heap.clear()
+            self._queued.clear()
+            self._condition.notify_all()
+            threads = list(self._threads)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _push(self, key, func, priority: float):
+        sequence = next(self._sequence)
+        self._queued[key] = (priority, func, sequence)
+        heapq.heappush(self._heap, (-priority, sequence, key))
+
+    def _pop(self):
+        while True:
+            _, sequence, key = heapq.heappop(self._heap)
+            queued = self._queued.get(key)
+            # Entries replaced by a higher priority push are skipped.
+            if queued is not None and queued[2] == sequence:
+                del self._queued[key]
+                return key, queued[1]
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._queued:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                key, func = self._pop()
+                self._running.add(key)
+
+            failed = False
+            try:
+                func()
+            except Exception:
+                failed = True
+
+            with self._condition:
+                self._running.discard(key)
+                self._completed += 1
+                self._failed += failed
@@ -0,0 +1,158 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls sharing a key into a single execution.
+
+    The first caller for a key runs the function; callers arriving while
+    it is in flight wait for it and get the same result or exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._collapsed = 0
+
+    @property
+    def collapsed(self) -> int:
+        """Number of calls served by another caller's execution"""
+        return self._collapsed
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._collapsed += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def do_many(self, keys, func) -> dict:
+        """
+        Like `do` for several keys at once. `func` gets the list of the
+        keys not already in flight and returns a dict of key to result,
+        None for the keys it leaves out; the other keys wait for the
+        calls running them.
+
+        :return: dict of key to result, or to the exception raised for
+            the key
+        """
+        leading = {}
+        following = {}
+        with self._lock:
+            for key in keys:
+                if key in leading or key in following:
+                    continue
+                call = self._calls.get(key)
+                if call is None:
+                    leading[key] = self._calls[key] = _Call()
+                else:
+                    following[key] = call
+                    self._collapsed += 1
+
+        if leading:
+            try:
+                found = func(list(leading))
+            except BaseException as error:
+                for call in leading.values():
+                    call.error = error
+                if not isinstance(error, Exception):
+                    raise
+            else:
+                for key, call in leading.items():
+                    result = found.get(key)
+                    if isinstance(result, Exception):
+                        call.error = result
+                    else:
+                        call.result = result
+            finally:
+                with self._lock:
+                    for key in leading:
+                        del self._calls[key]
+                for call in leading.values():
+                    call.done.set()
+
+        results = {}
+        for key, call in {**leading, **following}.items():
+            call.done.wait()
+            results[key] = call.result if call.error is None else call.error
+        return results
+
+
+class AsyncSingleFlight:
+    """
+    Asyncio counterpart of `SingleFlight` for use within one event loop.
+
+    Cancelling the caller running the function doesn't cancel the
+    callers waiting for it: one of them runs the function instead.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._collapsed = 0
+
+    @property
+    def collapsed(self) -> int:
+        """Number of calls served by another caller's execution"""
+        return self._collapsed
+
+    async def do(self, key, coroutine_func):
+        # Already loaded by the running event loop, keeps the sync
+        # client's import free of asyncio.
+        import asyncio
+
+        future = self._calls.get(key)
+        while future is not None:
+            self._collapsed += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    # This caller was cancelled, not the shared call.
+                    raise
+            # The leader was cancelled: run the call again, or join
+            # the follower that already did.
+            self._collapsed -= 1
+            future = self._calls.get(key)
+
+        future = self._calls[key] = asyncio.get_event_loop().create_future()
+        try:
+            result = await coroutine_func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # Mark as retrieved: nobody may be waiting for this call.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
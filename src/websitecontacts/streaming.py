@@ -0,0 +1,94 @@
+from collections import OrderedDict
+import json
+import os
+
+from .client import Client
+from .domains import normalize_domain
+from .exceptions.error import ParameterError, WebsiteContactsApiError
+
+
+def stream(client: Client, source, output=None, hard_refresh: bool = False,
+           max_in_flight: int = 10, dedupe_window: int = 100000):
+    """
+    Look up domains read lazily from a file or an iterable.
+
+    Lines are normalized with `normalize_domain`, so URLs and `www.`
+    prefixes are accepted; blank lines and lines starting with `#` are
+    skipped. Repeated domains are dropped as long as they
+    are seen again within the last `dedupe_window` distinct domains, so
+    memory use doesn't grow with the input size. Invalid domains are
+    yielded with a `ParameterError` and never sent to the API.
+
+    Results are written to `output` as NDJSON while the generator is
+    consumed, one object per domain:
+    `{"domain": ..., "response": {...}}` or
+    `{"domain": ..., "error": {"type": ..., "message": ...}}`.
+
+    :key client: Required. `Client` instance used for lookups.
+    :key source: Required. Path to a file with one domain per line
+        or an iterable of domain names.
+    :key output: Optional. Path or text file object for NDJSON results.
+    :key hard_refresh: Optional. Boolean.
+    :key max_in_flight: Optional. Number of concurrent lookups.
+    :key dedupe_window: Optional. Number of recently seen domains
+        remembered for deduplication.
+    :return: generator of (domain, `Response` or exception) pairs
+    """
+
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'w', encoding='utf-8') as fp:
+            yield from stream(client, source, fp, hard_refresh,
+                              max_in_flight, dedupe_window)
+        return
+
+    results = client.get_many(
+        _unique(_read_domains(source), dedupe_window),
+        hard_refresh=hard_refresh, max_workers=max_in_flight)
+
+    for domain, result in results:
+        if output is not None:
+            output.write(_to_ndjson(domain, result))
+        yield domain, result
+
+
+def _read_domains(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8') as fp:
+            yield from _read_domains(fp)
+        return
+
+    for line in source:
+        domain = str(line).strip().lower()
+        if not domain or domain.startswith('#'):
+            continue
+        try:
+            yield normalize_domain(domain)
+        except ParameterError:
+            # Passed on as is and reported by the client's validation.
+            yield domain
+
+
+def _unique(domains, window: int):
+    seen = OrderedDict()
+    for domain in domains:
+        if domain in seen:
+            seen.move_to_end(domain)
+            continue
+        seen[domain] = None
+        if len(seen) > window:
+            seen.popitem(last=False)
+        yield domain
+
+
+def _to_ndjson(domain: str, result) -> str:
+    if isinstance(result, Exception):
+        if isinstance(result, WebsiteContactsApiError):
+            message = result.message
+        else:
+            message = str(result)
+        record = {'domain': domain, 'error': {
+            'type': type(result).__name__, 'message': str(message)}}
+    else:
+        record = {'domain': domain, 'response': result.to_dict()}
+
+    return json.dumps(record, ensure_ascii=False) + '\n'
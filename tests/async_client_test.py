@@ -0,0 +1,67 @@
+import unittest
+
+from websitecontacts import AsyncClient, Response
+from websitecontacts import ApiAuthError, ParameterError
+from tests.stub import API_KEY, StubServer, run_async
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncClient(unittest.TestCase):
+    """
+    Tests against a local stub server.
+    """
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = StubServer().start()
+        cls.url = cls.server.url
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def _run(self, coroutine_factory):
+        async def wrapper():
+            async with AsyncClient(API_KEY, base_url=self.url,
+                                   max_concurrency=2) as client:
+                return await coroutine_factory(client)
+        return run_async(wrapper())
+
+    def test_get(self):
+        response = self._run(lambda client: client.get('youtube.com'))
+        self.assertIsInstance(response, Response)
+        self.assertEqual(response.domain_name, 'youtube.com')
+
+    def test_auth_error(self):
+        with self.assertRaises(ApiAuthError):
+            self._run(lambda client: client.get('denied.com'))
+
+    def test_invalid_domain(self):
+        with self.assertRaises(ParameterError):
+            self._run(lambda client: client.get('345.#ab.%org'))
+
+    def test_get_many(self):
+        domains = ['a.com', 'denied.com', 'b.com', 'c.com']
+        results = self._run(lambda client: client.get_many(domains))
+        self.assertEqual([d for d, _ in results], domains)
+        self.assertEqual(results[0][1].domain_name, 'a.com')
+        self.assertIsInstance(results[1][1], ApiAuthError)
+        self.assertEqual(results[3][1].domain_name, 'c.com')
+
+    def test_coalescing(self):
+        async def lookups(client):
+            results = await client.get_many(['x.com'] * 5)
+            return results, client.collapsed_requests
+
+        results, collapsed = self._run(lookups)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(collapsed, 4)
+        self.assertEqual(self.server.requests.count('x.com'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
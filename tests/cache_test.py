@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from websitecontacts.cache import CacheEntry, MemoryCache, SqliteCache
+
+
+def _write_entry(path: str, domain: str):
+    SqliteCache(path).set((domain, 'json'), CacheEntry(domain.encode()))
+
+
+class TestMemoryCache(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        cache = MemoryCache()
+        self.assertIsNone(cache.get(('a.com', 'json')))
+        entry = CacheEntry(b'{}')
+        cache.set(('a.com', 'json'), entry)
+        self.assertIs(cache.get(('a.com', 'json')), entry)
+        self.assertIsNone(cache.get(('a.com', 'xml')))
+        self.assertEqual(cache.stats(), {
+            'hits': 1, 'misses': 2, 'evictions': 0, 'expirations': 0})
+
+    def test_ttl(self):
+        cache = MemoryCache(ttl=60)
+        cache.set(('a.com', 'json'), CacheEntry(b'{}', time.time() - 61))
+        cache.set(('b.com', 'json'), CacheEntry(b'{}', time.time() - 59))
+        self.assertIsNone(cache.get(('a.com', 'json')))
+        self.assertIsNotNone(cache.get(('b.com', 'json')))
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(max_size=2)
+        cache.set(('a.com', 'json'), CacheEntry(b'a'))
+        cache.set(('b.com', 'json'), CacheEntry(b'b'))
+        cache.get(('a.com', 'json'))
+        cache.set(('c.com', 'json'), CacheEntry(b'c'))
+        self.assertIsNone(cache.get(('b.com', 'json')))
+        self.assertEqual(cache.get(('a.com', 'json')).raw, b'a')
+        self.assertEqual(cache.evictions, 1)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            MemoryCache(ttl=0)
+        with self.assertRaises(ValueError):
+            MemoryCache(max_size=0)
+
+
+class TestSqliteCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'cache.db')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_shared_between_processes(self):
+        cache = SqliteCache(self.path)
+        process = multiprocessing.Process(
+            target=_write_entry, args=(self.path, 'a.com'))
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+        self.assertEqual(cache.get(('a.com', 'json')).raw, b'a.com')
+        self.assertIsNone(cache.get(('a.com', 'xml')))
+
+    def test_validators(self):
+        with sqlite3.connect(self.path) as connection:
+            # Schema of files created before validators were stored.
+            connection.execute(
+                'CREATE TABLE responses (domain TEXT NOT NULL, '
+                'output_format TEXT NOT NULL, raw BLOB NOT NULL, '
+                'stored_at REAL NOT NULL, '
+                'PRIMARY KEY (domain, output_format)) WITHOUT ROWID')
+        connection.close()
+
+        cache = SqliteCache(self.path, ttl=60)
+        cache.set(('a.com', 'json'), CacheEntry(
+            b'a', time.time() - 61, '"abc"', 'Mon, 01 Jan 2024 00:00:00 GMT'))
+        cache.set(('b.com', 'json'), CacheEntry(b'b', time.time() - 61))
+        self.assertIsNone(cache.get(('a.com', 'json')))
+        self.assertIsNone(cache.get(('b.com', 'json')))
+
+        stale = cache.get_stale(('a.com', 'json'))
+        self.assertEqual(stale.etag, '"abc"')
+        self.assertEqual(stale.last_modified, 'Mon, 01 Jan 2024 00:00:00 GMT')
+        self.assertIsNone(cache.get_stale(('b.com', 'json')))
+
+        cache.refresh(('a.com', 'json'), CacheEntry(b'a', etag='"abc"'))
+        self.assertEqual(cache.get(('a.com', 'json')).raw, b'a')
+        self.assertEqual(cache.stats(), {
+            'hits': 2, 'misses': 1, 'evictions': 0, 'expirations': 2})
+
+    def test_ttl_and_compact(self):
+        cache = SqliteCache(self.path, ttl=60)
+        cache.set(('a.com', 'json'), CacheEntry(b'a', time.time() - 61))
+        cache.set(('b.com', 'json'), CacheEntry(b'b', time.time() - 120))
+        cache.set(('c.com', 'json'), CacheEntry(b'c'))
+        self.assertIsNone(cache.get(('a.com', 'json')))
+        self.assertEqual(cache.compact(), 1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get(('c.com', 'json')).raw, b'c')
+        self.assertEqual(cache.expirations, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
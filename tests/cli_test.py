@@ -0,0 +1,124 @@
+from contextlib import redirect_stdout
+import glob
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from websitecontacts.cli import main, _cut_partial_line, _last_line
+from tests.stub import API_KEY, StubServer
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = StubServer().start()
+        self.tmp = tempfile.mkdtemp()
+        self.input = os.path.join(self.tmp, 'domains.txt')
+        self.output = os.path.join(self.tmp, 'out')
+        self.domains = ['d{}.com'.format(i) for i in range(40)]
+        with open(self.input, 'w') as fp:
+            fp.write('# domains\n')
+            fp.write('\n'.join(self.domains + ['https://www.D1.com/']))
+            fp.write('\nbad domain\n')
+
+    def tearDown(self) -> None:
+        self.server.stop()
+        shutil.rmtree(self.tmp)
+
+    def run_cli(self, *extra) -> int:
+        with redirect_stdout(io.StringIO()):
+            return main([self.input, self.output, '--api-key', API_KEY,
+                         '--base-url', self.server.url, '--threads', '4']
+                        + list(extra))
+
+    def lines(self, pattern: str = 'results-*.ndjson') -> list:
+        lines = []
+        for path in sorted(glob.glob(os.path.join(self.output, pattern))):
+            with open(path) as fp:
+                lines.extend(fp)
+        return lines
+
+    def results(self, pattern: str = 'results-*.ndjson') -> dict:
+        records = {}
+        for line in self.lines(pattern):
+            record = json.loads(line)
+            records[record['domain']] = record
+        return records
+
+    def test_run_and_resume(self):
+        self.assertEqual(0, self.run_cli('--processes', '3'))
+        self.assertEqual(3, len(glob.glob(
+            os.path.join(self.output, 'results-*.ndjson'))))
+        records = self.results()
+        self.assertEqual(set(self.domains + ['bad domain']), set(records))
+        self.assertEqual('ParameterError',
+                         records['bad domain']['error']['type'])
+        self.assertEqual(sorted(self.domains), sorted(self.server.requests))
+
+        # The shard count of the first run is kept.
+        self.assertEqual(0, self.run_cli('--processes', '1'))
+        self.assertEqual(len(self.domains), len(self.server.requests))
+        self.assertEqual(3, len(glob.glob(
+            os.path.join(self.output, 'progress-*.txt'))))
+        self.assertEqual(len(self.domains) + 1, len(self.lines()))
+
+    def test_killed_between_result_and_progress(self):
+        self.assertEqual(0, self.run_cli('--processes', '1'))
+        progress = os.path.join(self.output, 'progress-0000.txt')
+        with open(progress) as fp:
+            done = fp.readlines()
+        with open(progress, 'w') as fp:
+            fp.writelines(done[:-1])
+
+        self.server.requests.clear()
+        self.assertEqual(0, self.run_cli())
+        self.assertListEqual([], self.server.requests)
+        self.assertEqual(len(self.domains) + 1, len(self.lines()))
+
+    def test_batches(self):
+        self.assertEqual(0, self.run_cli('--processes', '2',
+                                         '--batch-size', '8'))
+        self.assertEqual(set(self.domains + ['bad domain']),
+                         set(self.results()))
+        self.assertEqual(self.server.requests, [])
+        self.assertEqual(sorted(self.domains),
+                         sorted(sum(self.server.batches, [])))
+
+    def test_failed_lookups_are_retried(self):
+        self.server.failures['d7.com'] = 100
+        self.assertEqual(1, self.run_cli('--processes', '2'))
+        self.assertNotIn('d7.com', self.results())
+        self.assertEqual(len(self.domains), len(self.lines()))
+        self.assertEqual('HttpApiError', self.results(
+            'errors-*.ndjson')['d7.com']['error']['type'])
+
+        self.server.failures.clear()
+        self.server.requests.clear()
+        self.assertEqual(0, self.run_cli())
+        self.assertListEqual(['d7.com'], self.server.requests)
+        self.assertIn('response', self.results()['d7.com'])
+        self.assertEqual(len(self.domains) + 1, len(self.lines()))
+
+    def test_cut_partial_line(self):
+        path = os.path.join(self.tmp, 'progress.txt')
+        with open(path, 'w') as fp:
+            fp.write('a.com\n' + 'x' * 100000)
+        _cut_partial_line(path)
+        with open(path) as fp:
+            self.assertEqual('a.com\n', fp.read())
+
+    def test_last_line(self):
+        path = os.path.join(self.tmp, 'results.ndjson')
+        self.assertIsNone(_last_line(path))
+        with open(path, 'w') as fp:
+            fp.write('{"domain": "a.com"}\n')
+        self.assertEqual('{"domain": "a.com"}', _last_line(path))
+        with open(path, 'a') as fp:
+            fp.write('{"domain": "b.com", "x": "%s"}\n' % ('x' * 100000))
+        self.assertTrue(_last_line(path).startswith('{"domain": "b.com"'))
+
+
+if __name__ == '__main__':
+    unittest.main()
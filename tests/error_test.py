@@ -0,0 +1,62 @@
+import json
+import pickle
+import unittest
+
+from websitecontacts import ApiAuthError, Client, HttpApiError, \
+    ResponseError, UnparsableApiResponseError
+from tests.stub import API_KEY, StubServer
+
+
+class TestErrors(unittest.TestCase):
+    body = json.dumps({'code': 403, 'messages': 'Access restricted'})
+
+    def test_lazy_parsed_message(self):
+        error = ResponseError(self.body, 403)
+        self.assertFalse(error._parsed)
+        self.assertEqual('Access restricted', error.parsed_message.message)
+        self.assertIs(error.parsed_message, error.parsed_message)
+
+    def test_unparsable_message(self):
+        self.assertIsNone(ResponseError('<html>Bad gateway</html>')
+                          .parsed_message)
+        self.assertIsNone(ResponseError('{not json').parsed_message)
+
+    def test_str(self):
+        self.assertEqual('403: ' + self.body,
+                         str(ApiAuthError(self.body, 403)))
+        self.assertEqual('Invalid domain name',
+                         str(HttpApiError('Invalid domain name')))
+
+    def test_slots(self):
+        error = ApiAuthError(self.body, 403, 0.5)
+        self.assertNotIn('status_code', error.__dict__)
+        self.assertEqual(403, error.status_code)
+        self.assertEqual(0.5, error.latency)
+
+    def test_pickle(self):
+        error = pickle.loads(pickle.dumps(ApiAuthError(self.body, 403, 0.5)))
+        self.assertEqual((self.body, 403, 0.5),
+                         (error.message, error.status_code, error.latency))
+        self.assertEqual('Access restricted', error.parsed_message.message)
+
+        origin = ValueError('bad')
+        error = pickle.loads(pickle.dumps(
+            UnparsableApiResponseError('Could not parse', origin)))
+        self.assertEqual('Could not parse', error.message)
+        self.assertIsInstance(error.original_error, ValueError)
+
+    def test_status_and_latency_from_api(self):
+        server = StubServer(delay=0.05).start()
+        try:
+            client = Client(API_KEY, base_url=server.url)
+            with self.assertRaises(ApiAuthError) as context:
+                client.get('denied.com')
+        finally:
+            server.stop()
+        self.assertEqual(403, context.exception.status_code)
+        self.assertGreaterEqual(context.exception.latency, 0.05)
+        self.assertEqual(403, context.exception.parsed_message.code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import time
+import unittest
+
+from websitecontacts import Client, HedgePolicy, Response
+from tests.stub import API_KEY, StubServer
+
+
+class TestHedgePolicy(unittest.TestCase):
+
+    def test_delay(self):
+        policy = HedgePolicy(percentile=90, window=20, min_samples=10,
+                             min_delay=0)
+        for latency in range(1, 10):
+            policy.record(latency / 100)
+        self.assertIsNone(policy.delay())
+        policy.record(1)
+        self.assertEqual(0.09, policy.delay())
+        policy.record(2)
+        self.assertEqual(1, policy.delay())
+
+    def test_periodic_update(self):
+        policy = HedgePolicy(percentile=50, window=100, min_samples=1,
+                             min_delay=0)
+        policy.record(1)
+        self.assertEqual(1, policy.delay())
+        for _ in range(4):
+            policy.record(3)
+        self.assertEqual(1, policy.delay())
+        policy.record(3)
+        self.assertEqual(3, policy.delay())
+
+    def test_min_delay(self):
+        policy = HedgePolicy(min_samples=1, min_delay=0.5)
+        policy.record(0.01)
+        self.assertEqual(0.5, policy.delay())
+
+    def test_window(self):
+        policy = HedgePolicy(percentile=50, window=3, min_samples=3,
+                             min_delay=0)
+        for latency in (5, 5, 5, 1, 1, 1):
+            policy.record(latency)
+        self.assertEqual(1, policy.delay())
+
+    def test_budget(self):
+        policy = HedgePolicy(budget=0.5, burst=2)
+        self.assertFalse(policy.acquire())
+        policy.record(0.1)
+        self.assertFalse(policy.acquire())
+        for _ in range(10):
+            policy.record(0.1)
+        self.assertTrue(policy.acquire())
+        self.assertTrue(policy.acquire())
+        self.assertFalse(policy.acquire())
+        self.assertDictEqual(
+            {'hedged': 2, 'wins': 0, 'denied': 3}, policy.stats())
+
+    def test_invalid(self):
+        for kwargs in ({'percentile': 100}, {'window': 0},
+                       {'min_samples': 0}, {'window': 5, 'min_samples': 6},
+                       {'min_delay': -1}, {'budget': 0}, {'budget': 2},
+                       {'burst': 0}):
+            with self.assertRaises(ValueError):
+                HedgePolicy(**kwargs)
+        with self.assertRaises(ValueError):
+            Client(API_KEY, hedge=0.95)
+
+
+class TestHedging(unittest.TestCase):
+    """
+    Hedged calls against a local stub server.
+    """
+    def setUp(self) -> None:
+        self.server = StubServer().start()
+        self.policy = HedgePolicy(min_samples=5, budget=1, burst=2)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _warm_up(self, client: Client):
+        for _ in range(5):
+            client.get('example.com')
+        self.assertIsNotNone(self.policy.delay())
+        self.assertEqual(0, self.policy.stats()['hedged'])
+
+    def _assert_hedged(self, client: Client):
+        self._warm_up(client)
+        self.server.stalls['slow.com'] = 1
+        started = time.monotonic()
+        self.assertIsInstance(client.get('slow.com'), Response)
+        # The stalled request was cancelled instead of awaited.
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertListEqual(['slow.com'] * 2, self.server.requests[5:])
+        self.assertDictEqual(
+            {'hedged': 1, 'wins': 1, 'denied': 0}, self.policy.stats())
+
+    def test_pooled(self):
+        self._assert_hedged(Client(
+            API_KEY, base_url=self.server.url, hedge=self.policy,
+            pooled=True))
+
+    def test_not_pooled(self):
+        self._assert_hedged(Client(
+            API_KEY, base_url=self.server.url, hedge=self.policy))
+
+    def test_buffered(self):
+        self._assert_hedged(Client(
+            API_KEY, base_url=self.server.url, hedge=self.policy,
+            pooled=True, max_response_size=65536))
+
+    def test_adaptive_concurrency(self):
+        client = Client(API_KEY, base_url=self.server.url, hedge=self.policy,
+                        pooled=True, max_concurrency=16,
+                        adaptive_concurrency=True)
+        limiter = client.api_requester.concurrency_limiter
+        self._warm_up(client)
+        for _ in range(2):
+            self.server.stalls['slow.com'] = 1
+            client.get('slow.com')
+        # Cancelled losers aren't taken for overload.
+        self.assertEqual(2, self.policy.stats()['wins'])
+        self.assertEqual(16, limiter.limit)
+        self.assertEqual(0, limiter.in_flight)
+
+    def test_over_budget(self):
+        policy = HedgePolicy(min_samples=5, min_delay=0.05, budget=0.1)
+        client = Client(API_KEY, base_url=self.server.url, hedge=policy,
+                        pooled=True)
+        for _ in range(5):
+            client.get('example.com')
+        self.server.delay = 0.1
+        client.get('example.com')
+        self.assertListEqual(['example.com'] * 6, self.server.requests)
+        self.assertDictEqual(
+            {'hedged': 0, 'wins': 0, 'denied': 1}, policy.stats())
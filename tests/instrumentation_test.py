@@ -0,0 +1,79 @@
+import socket
+import unittest
+
+from websitecontacts import Client
+from websitecontacts import ApiAuthError, ParameterError
+from websitecontacts.instrumentation import Instrumentation, \
+    PrometheusExporter, StatsdExporter
+from tests.stub import API_KEY, StubServer
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Instrumentation hooks against a local stub server.
+    """
+    def setUp(self) -> None:
+        self.server = StubServer().start()
+        self.instrumentation = Instrumentation()
+        self.timings = []
+        self.errors = []
+        self.instrumentation.on_timing(
+            lambda stage, seconds: self.timings.append(stage))
+        self.instrumentation.on_error(self.errors.append)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _client(self, pooled: bool) -> Client:
+        return Client(API_KEY, base_url=self.server.url, pooled=pooled,
+                      instrumentation=self.instrumentation)
+
+    def test_stages(self):
+        for pooled in (False, True):
+            self.timings.clear()
+            client = self._client(pooled)
+            client.get('a.com')
+            self.assertEqual(sorted(self.timings),
+                             sorted(Instrumentation.STAGES))
+            client.close()
+
+    def test_errors(self):
+        client = self._client(True)
+        with self.assertRaises(ApiAuthError):
+            client.get('denied.com')
+        with self.assertRaises(ParameterError):
+            client.get_raw('345.#ab.%org')
+        self.assertEqual(self.errors, ['ApiAuthError', 'ParameterError'])
+        client.close()
+
+    def test_prometheus(self):
+        exporter = PrometheusExporter().attach(self.instrumentation)
+        client = self._client(True)
+        client.get('a.com')
+        client.get('b.com')
+        with self.assertRaises(ApiAuthError):
+            client.get('denied.com')
+        text = exporter.render()
+        self.assertIn(
+            'websitecontacts_stage_seconds_count{stage="decode"} 2', text)
+        self.assertIn(
+            'websitecontacts_stage_seconds_count{stage="connect"} 1', text)
+        self.assertIn(
+            'websitecontacts_errors_total{error="ApiAuthError"} 1', text)
+        client.close()
+
+    def test_statsd(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(('127.0.0.1', 0))
+        receiver.settimeout(1)
+        exporter = StatsdExporter(
+            '127.0.0.1', receiver.getsockname()[1], 'wc')
+        exporter.attach(self.instrumentation)
+        self.instrumentation.error(ApiAuthError(''))
+        self.assertEqual(receiver.recv(1024), b'wc.errors.ApiAuthError:1|c')
+        exporter.close()
+        receiver.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
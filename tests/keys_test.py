@@ -0,0 +1,103 @@
+import unittest
+
+from websitecontacts import AsyncClient, Client, KeyPool
+from websitecontacts import ApiAuthError, EmptyApiKeyError, ParameterError
+from tests.stub import StubServer, run_async
+
+KEYS = ['at_' + str(i) * 29 for i in range(1, 4)]
+
+
+class TestKeyPool(unittest.TestCase):
+    def test_round_robin(self):
+        pool = KeyPool(KEYS)
+        picked = []
+        for _ in range(6):
+            key = pool.acquire()
+            pool.release(key)
+            picked.append(key)
+        self.assertListEqual(KEYS * 2, picked)
+        self.assertEqual(2, pool.stats()[KEYS[0]]['requests'])
+
+    def test_least_loaded(self):
+        pool = KeyPool(KEYS, KeyPool.LEAST_LOADED)
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertNotEqual(first, second)
+        pool.release(first)
+        self.assertEqual(KEYS[2], pool.acquire())
+        self.assertEqual(1, pool.stats()[second]['in_flight'])
+
+    def test_disable(self):
+        pool = KeyPool(KEYS[:2])
+        pool.disable(KEYS[0])
+        self.assertListEqual([KEYS[1]], pool.active_keys)
+        self.assertEqual(KEYS[1], pool.acquire())
+        pool.disable(KEYS[1])
+        with self.assertRaises(EmptyApiKeyError):
+            pool.acquire()
+        pool.enable(KEYS[0])
+        self.assertEqual(KEYS[0], pool.acquire())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            KeyPool([])
+        with self.assertRaises(ValueError):
+            KeyPool(KEYS, 'random')
+        with self.assertRaises(ParameterError):
+            Client(KEYS + ['bad key'])
+
+
+class TestClientKeys(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = StubServer().start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_rotation(self):
+        client = Client(KEYS, base_url=self.server.url)
+        for i in range(6):
+            client.get('d{}.com'.format(i))
+        self.assertListEqual(KEYS * 2, self.server.api_keys)
+        self.assertEqual(2, client.key_usage[KEYS[2]]['requests'])
+        client.close()
+
+    def test_revoked_key(self):
+        self.server.revoked_keys.add(KEYS[0])
+        client = Client(KEYS, base_url=self.server.url)
+        self.assertEqual('d0.com', client.get('d0.com').domain_name)
+        client.get('d1.com')
+        client.get('d2.com')
+        usage = client.key_usage
+        self.assertFalse(usage[KEYS[0]]['active'])
+        self.assertEqual(1, usage[KEYS[0]]['errors'])
+        self.assertEqual(1, usage[KEYS[0]]['requests'])
+        self.assertListEqual(KEYS[1:], client.key_pool.active_keys)
+        client.close()
+
+    def test_all_keys_revoked(self):
+        self.server.revoked_keys.update(KEYS)
+        client = Client(KEYS, base_url=self.server.url)
+        with self.assertRaises(ApiAuthError):
+            client.get('d0.com')
+        self.assertEqual(3, len(self.server.api_keys))
+        with self.assertRaises(EmptyApiKeyError):
+            client.get('d0.com')
+        client.close()
+
+    def test_async_rotation(self):
+        self.server.revoked_keys.add(KEYS[1])
+
+        async def run():
+            async with AsyncClient(KEYS, base_url=self.server.url) as client:
+                for i in range(4):
+                    await client.get('d{}.com'.format(i))
+                return client.key_usage
+
+        usage = run_async(run())
+        self.assertFalse(usage[KEYS[1]]['active'])
+        self.assertEqual(5, sum(u['requests'] for u in usage.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
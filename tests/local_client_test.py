@@ -0,0 +1,309 @@
+import io
+import json
+import threading
+import time
+import unittest
+
+from websitecontacts import Client, Response, stream
+from websitecontacts import ApiRequester, ApiAuthError, HttpApiError, \
+    ParameterError, UnparsableApiResponseError, ResponseTooLargeError
+from websitecontacts.cache import MemoryCache
+from tests.stub import API_KEY, StubHandler, StubServer
+
+
+class NotModifiedHandler(StubHandler):
+    """Answers 304 whatever the request, like a broken proxy."""
+
+    def do_GET(self):
+        self.send_body(304, b'', 'application/json')
+
+    do_POST = do_GET
+
+
+class NoValidatorsHandler(StubHandler):
+    """Answers without an ETag, like an API that stopped sending one."""
+
+    def send_body(self, status: int, payload: bytes, content_type: str,
+                  headers=None):
+        super().send_body(status, payload, content_type)
+
+
+class TestLocalClient(unittest.TestCase):
+    """
+    Client tests against a local stub server.
+    """
+    def setUp(self) -> None:
+        self.server = StubServer().start()
+        self.client = Client(API_KEY, base_url=self.server.url,
+                             pooled=True, pool_size=4)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_get_many_ordered(self):
+        domains = ['d{}.com'.format(i) for i in range(50)] + ['denied.com']
+        results = list(self.client.get_many(
+            iter(domains), max_workers=4, ordered=True))
+        self.assertEqual([d for d, _ in results], domains)
+        for domain, result in results[:-1]:
+            self.assertIsInstance(result, Response)
+            self.assertEqual(result.domain_name, domain)
+        self.assertIsInstance(results[-1][1], ApiAuthError)
+        self.assertIsNone(self.client.last_result)
+
+    def test_get_many_unordered(self):
+        domains = ['d{}.com'.format(i) for i in range(50)]
+        results = dict(self.client.get_many(domains, max_workers=4))
+        self.assertEqual(sorted(results), sorted(domains))
+
+    def test_get_many_invalid_domain(self):
+        results = dict(self.client.get_many(['a.com', '345.#ab.%org']))
+        self.assertIsInstance(results['345.#ab.%org'], ParameterError)
+        self.assertIsInstance(results['a.com'], Response)
+
+    def test_get_many_invalid_workers(self):
+        with self.assertRaises(ParameterError):
+            self.client.get_many(['a.com'], max_workers=0)
+
+    def test_stream(self):
+        source = ['A.com\n', 'b.com\n', '\n', '# comment\n', 'a.com\n',
+                  '345.#ab.%org\n', 'denied.com\n']
+        output = io.StringIO()
+        results = dict(stream(self.client, iter(source), output,
+                              max_in_flight=2))
+        self.assertEqual(
+            sorted(results), ['345.#ab.%org', 'a.com', 'b.com', 'denied.com'])
+        self.assertEqual(sorted(self.server.requests),
+                         ['a.com', 'b.com', 'denied.com'])
+
+        records = {r['domain']: r for r in map(
+            json.loads, output.getvalue().splitlines())}
+        self.assertEqual(records['a.com']['response']['domain_name'], 'a.com')
+        self.assertEqual(records['denied.com']['error']['type'],
+                         'ApiAuthError')
+        self.assertEqual(records['345.#ab.%org']['error']['type'],
+                         'ParameterError')
+
+    def test_cache(self):
+        self.client.cache = MemoryCache()
+        first = self.client.get('a.com')
+        self.assertIs(self.client.get('a.com'), first)
+        self.assertEqual(self.client.get_raw('a.com'),
+                         self.client.get_raw('a.com'))
+        self.assertEqual(self.server.requests, ['a.com'])
+
+        refreshed = self.client.get('a.com', hard_refresh=True)
+        self.assertIsNot(refreshed, first)
+        self.assertIs(self.client.get('a.com'), refreshed)
+        self.assertEqual(self.server.requests, ['a.com', 'a.com'])
+        self.assertEqual(self.client.cache.misses, 1)
+
+    def test_coalescing(self):
+        self.server.delay = 0.3
+        results = list(self.client.get_many(['a.com'] * 4, max_workers=4))
+        self.assertEqual(len(results), 4)
+        self.assertEqual(self.server.requests, ['a.com'])
+        self.assertEqual(self.client.collapsed_requests, 3)
+
+    def test_json_decoder(self):
+        decoded = []
+
+        def decoder(raw):
+            decoded.append(raw)
+            return json.loads(raw)
+
+        client = Client(API_KEY, base_url=self.server.url,
+                        json_decoder=decoder)
+        self.assertEqual(client.get('a.com').domain_name, 'a.com')
+        self.assertIsInstance(decoded[0], bytes)
+        self.assertEqual(client.get_raw_bytes('b.com'), decoded[0].replace(
+            b'a.com', b'b.com'))
+
+        with self.assertRaises(ValueError):
+            Client(API_KEY, json_decoder='yaml')
+
+    def test_get_xml(self):
+        response = self.client.get('a.com', output_format=Client.XML_FORMAT)
+        self.assertEqual(response.domain_name, 'a.com')
+        self.assertTrue(response.website_responded)
+        self.assertEqual(response, self.client.get('a.com'))
+
+    def test_unexpected_not_modified(self):
+        server = StubServer(NotModifiedHandler).start()
+        requester = ApiRequester(base_url=server.url)
+        payload = {'apiKey': API_KEY, 'domainName': 'a.com'}
+        with self.assertRaises(HttpApiError) as context:
+            requester.get_bytes(dict(payload))
+        self.assertEqual(304, context.exception.status_code)
+        with self.assertRaises(HttpApiError):
+            requester.post_bytes({'apiKey': API_KEY, 'domainNames': []})
+        with self.assertRaises(HttpApiError):
+            requester.get_conditional(dict(payload))
+        self.assertIsNone(
+            requester.get_conditional(dict(payload), etag='"a"')[0])
+
+        client = Client(API_KEY, base_url=server.url, cache=MemoryCache())
+        with self.assertRaises(HttpApiError):
+            client.get('a.com')
+        server.stop()
+
+    def test_validators_replaced(self):
+        server = StubServer(NoValidatorsHandler).start()
+        requester = ApiRequester(base_url=server.url)
+        payload = {'apiKey': API_KEY, 'domainName': 'a.com'}
+        content, etag, last_modified = requester.get_conditional(
+            payload, etag='"a"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+        # A full answer without validators drops the old ones.
+        self.assertIsNotNone(content)
+        self.assertIsNone(etag)
+        self.assertIsNone(last_modified)
+        server.stop()
+
+    def test_compression(self):
+        self.server.emails = 200
+        plain = self.client.get_raw_bytes('a.com')
+        plain_bytes = self.server.bytes_sent
+
+        self.server.compress = True
+        self.assertEqual(self.client.get_raw_bytes('a.com'), plain)
+        compressed_bytes = self.server.bytes_sent - plain_bytes
+        self.assertEqual(len(plain), plain_bytes)
+        self.assertLess(compressed_bytes * 5, plain_bytes)
+
+    def test_conditional_request(self):
+        self.server.emails = 50
+        self.client.cache = MemoryCache(ttl=0.05)
+        first = self.client.get('a.com')
+        sent = self.server.bytes_sent
+        self.assertIsNotNone(self.client.cache.get_stale(
+            ('a.com', 'json')).etag)
+
+        time.sleep(0.1)
+        self.assertIs(self.client.get('a.com'), first)
+        self.assertEqual(self.server.requests, ['a.com', 'a.com'])
+        self.assertEqual(self.server.bytes_sent, sent)
+        self.assertEqual(self.client.cache.stats(), {
+            'hits': 1, 'misses': 1, 'evictions': 0, 'expirations': 1})
+
+        # Fresh again after revalidation.
+        self.assertIs(self.client.get('a.com'), first)
+        self.assertEqual(len(self.server.requests), 2)
+
+        # A hard refresh downloads the response in full.
+        self.client.get('a.com', hard_refresh=True)
+        self.assertGreater(self.server.bytes_sent, sent)
+
+    def test_get_many_batched(self):
+        domains = ['d{}.com'.format(i) for i in range(25)]
+        domains += ['denied.com', 'missing.com', 'bad domain']
+        results = list(self.client.get_many(
+            domains, max_workers=2, ordered=True, batch_size=10))
+        self.assertEqual([d for d, _ in results], domains)
+        for domain, result in results[:25]:
+            self.assertIsInstance(result, Response)
+            self.assertEqual(result.domain_name, domain)
+        self.assertIsInstance(results[25][1], ApiAuthError)
+        self.assertEqual(results[25][1].status_code, 403)
+        self.assertIsInstance(results[26][1], UnparsableApiResponseError)
+        self.assertIsInstance(results[27][1], ParameterError)
+
+        self.assertEqual([len(b) for b in self.server.batches], [10, 10, 7])
+        self.assertEqual(self.server.requests, [])
+        self.assertEqual(set(self.server.api_keys), {API_KEY})
+
+    def test_get_many_batched_cache(self):
+        self.client.cache = MemoryCache()
+        self.client.get('a.com')
+        results = dict(self.client.get_many(
+            ['a.com', 'b.com', 'B.com'], batch_size=10))
+        self.assertEqual(self.server.batches, [['b.com']])
+        self.assertIs(results['a.com'], self.client.get('a.com'))
+        self.assertIs(results['b.com'], results['B.com'])
+        self.assertIs(self.client.get('b.com'), results['b.com'])
+        self.assertEqual(self.server.requests, ['a.com'])
+
+    def test_get_many_batched_coalesced(self):
+        self.server.delay = 0.1
+        domains = ['d{}.com'.format(i) for i in range(10)]
+        lookups = [threading.Thread(target=self.client.get,
+                                    args=('d0.com',))]
+        lookups += [threading.Thread(target=lambda: list(
+            self.client.get_many(domains, batch_size=10)))
+            for _ in range(2)]
+        for lookup in lookups:
+            lookup.start()
+            time.sleep(0.02)
+        for lookup in lookups:
+            lookup.join()
+        # Overlapping batches wait for each other and for the get.
+        self.assertEqual(self.server.requests, ['d0.com'])
+        self.assertEqual(self.server.batches, [domains[1:]])
+
+    def test_get_many_batched_failure(self):
+        self.server.revoked_keys.add(API_KEY)
+        results = list(self.client.get_many(['a.com', 'b.com'], batch_size=5))
+        self.assertEqual(len(results), 2)
+        for _, result in results:
+            self.assertIsInstance(result, ApiAuthError)
+        with self.assertRaises(ParameterError):
+            self.client.get_many(['a.com'], batch_size=0)
+
+    def test_max_response_size(self):
+        self.server.emails = 100
+        received = []
+
+        def decoder(raw):
+            received.append(raw)
+            return json.loads(raw.tobytes())
+
+        client = Client(API_KEY, base_url=self.server.url, pooled=True,
+                        max_response_size=20000, json_decoder=decoder)
+        self.assertEqual(len(client.get('a.com').emails), 100)
+        self.assertEqual(len(client.get('b.com').emails), 100)
+        self.assertIsInstance(received[0], memoryview)
+        self.assertIs(received[0].obj, received[1].obj)
+        self.assertEqual(client.get('a.com', output_format='xml')
+                         .domain_name, 'a.com')
+
+        raw = client.get_raw_bytes('a.com')
+        self.assertIsInstance(raw, bytes)
+        self.assertEqual(raw, self.client.get_raw_bytes('a.com'))
+
+        self.server.emails = 1000
+        with self.assertRaises(ResponseTooLargeError):
+            client.get('a.com')
+        # Compressed bodies are checked once decoded.
+        self.server.compress = True
+        with self.assertRaises(ResponseTooLargeError):
+            client.get('a.com')
+        self.server.emails = 100
+        self.assertEqual(len(client.get('a.com').emails), 100)
+        with self.assertRaises(ApiAuthError):
+            client.get('denied.com')
+        client.close()
+
+        with self.assertRaises(ValueError):
+            Client(API_KEY, max_response_size=0)
+
+    def test_read_buffer_growth(self):
+        limit = 1 << 20
+        client = Client(API_KEY, base_url=self.server.url, pooled=True,
+                        max_response_size=limit)
+        self.server.emails = 10
+        small = len(client.get_raw_bytes('a.com'))
+        buffers = client.api_requester._buffers
+        # Sized from Content-Length, not from the limit.
+        self.assertEqual(small, len(buffers.buffer))
+
+        self.server.emails = 2000
+        self.server.compress = True
+        large = len(client.get_raw_bytes('a.com'))
+        self.assertGreater(large, 65536)
+        self.assertLessEqual(large, len(buffers.buffer))
+        self.assertLess(len(buffers.buffer), limit)
+        client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
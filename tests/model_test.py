@@ -1,7 +1,15 @@
+import csv
+import io
 import json
 import unittest
 from json import loads
-from websitecontacts import Response, ErrorMessage
+from websitecontacts import Response, ErrorMessage, ResponseBatch
+from websitecontacts.models.xml_parser import parse_xml
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 _json_response_ok = '''{
     "companyNames": [
@@ -51,6 +59,56 @@ _json_response_ok = '''{
     "websiteResponded": true
 }'''
 
+_xml_response_ok = '''<?xml version="1.0" encoding="utf-8"?>
+<websiteContacts>
+    <companyNames>
+        <companyName>Google LLC D/B/A YouTube</companyName>
+        <companyName>YouTube Community Guidelines &amp; Policies</companyName>
+        <companyName>Google Inc</companyName>
+        <companyName>Brand Resources</companyName>
+    </companyNames>
+    <countryCode>US</countryCode>
+    <domainName>youtube.com</domainName>
+    <emails>
+        <email>
+            <description>Press</description>
+            <email>press@google.com</email>
+        </email>
+        <email>
+            <description>Support</description>
+            <email>support@google.com</email>
+        </email>
+    </emails>
+    <meta>
+        <description>Enjoy the videos and music you love, upload\
+         original content, and share it all with\
+ friends, family, and the world on YouTube.</description>
+        <title>YouTube</title>
+    </meta>
+    <phones>
+        <phone>
+            <callHours></callHours>
+            <description></description>
+            <phoneNumber>650-253-0001</phoneNumber>
+        </phone>
+        <phone>
+            <callHours>10:00-19:00</callHours>
+            <description/>
+            <phoneNumber>650-253-0002</phoneNumber>
+        </phone>
+    </phones>
+    <postalAddresses>
+        <postalAddress>901 Cherry Ave. San Bruno CA 94066 USA</postalAddress>
+    </postalAddresses>
+    <socialLinks>
+        <facebook>https://www.facebook.com/youtube/?ref=br_r</facebook>
+        <instagram>https://www.instagram.com/youtube/</instagram>
+        <linkedIn></linkedIn>
+        <twitter>https://twitter.com/YouTube</twitter>
+    </socialLinks>
+    <websiteResponded>true</websiteResponded>
+</websiteContacts>'''
+
 _json_response_error = '''{
     "code": 403,
     "messages": "Access restricted. Check credits balance or enter the correct API key."
@@ -67,8 +125,8 @@ class TestModel(unittest.TestCase):
         self.assertEqual(parsed.country_code, response['countryCode'])
         self.assertEqual(parsed.domain_name, response['domainName'])
         self.assertIsInstance(parsed.emails, list)
-        self.assertDictEqual(vars(parsed.emails[0]), response['emails'][0])
-        self.assertDictEqual(vars(parsed.emails[1]), response['emails'][1])
+        self.assertDictEqual(parsed.emails[0].to_dict(), response['emails'][0])
+        self.assertDictEqual(parsed.emails[1].to_dict(), response['emails'][1])
 
         self.assertEqual(parsed.meta_description, response['meta']['description'])
         self.assertEqual(parsed.meta_title, response['meta']['title'])
@@ -90,6 +148,25 @@ class TestModel(unittest.TestCase):
         self.assertEqual(parsed.social_twitter, response['socialLinks']['twitter'])
         self.assertEqual(parsed.website_responded, response['websiteResponded'])
 
+    def test_lazy_lists(self):
+        response = loads(_json_response_ok)
+        parsed = Response(response)
+        self.assertFalse(hasattr(parsed, '__dict__'))
+        self.assertEqual(parsed['emails'][0].email, 'press@google.com')
+        self.assertIs(parsed.emails, parsed.emails)
+        parsed.phones = []
+        self.assertEqual(parsed.phones, [])
+        self.assertIn("{'description': 'Press', 'email'", str(parsed))
+
+    def test_xml_parsing(self):
+        from_json = Response(loads(_json_response_ok))
+        from_xml = Response(parse_xml(_xml_response_ok.encode('utf-8')))
+        self.assertEqual(from_xml, from_json)
+
+        chunks = [_xml_response_ok[i:i + 50]
+                  for i in range(0, len(_xml_response_ok), 50)]
+        self.assertEqual(Response(parse_xml(chunks)), from_json)
+
     def test_error_parsing(self):
         error = loads(_json_response_error)
         parsed_error = ErrorMessage(error)
@@ -100,3 +177,52 @@ class TestModel(unittest.TestCase):
         model1 = Response(json.loads(_json_response_ok))
         model2 = Response(json.loads(_json_response_ok))
         self.assertEqual(model1, model2)
+
+
+class TestResponseBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.payload = loads(_json_response_ok)
+        self.batch = ResponseBatch.from_payloads(
+            [self.payload, {'domainName': 'empty.com'}])
+
+    def test_columns(self):
+        self.assertEqual(len(self.batch), 2)
+        self.assertEqual(self.batch.domain_name, ['youtube.com', 'empty.com'])
+        self.assertEqual(list(self.batch.email_offsets), [0, 2, 2])
+        self.assertEqual(list(self.batch.phone_offsets), [0, 2, 2])
+        self.assertEqual(self.batch.email_email,
+                         ['press@google.com', 'support@google.com'])
+
+    def test_same_as_responses(self):
+        from_responses = ResponseBatch.from_responses(
+            [Response(self.payload)])
+        output = io.StringIO()
+        from_responses.to_ndjson(output)
+        self.assertEqual(json.loads(output.getvalue()),
+                         Response(self.payload).to_dict())
+
+    def test_csv(self):
+        output = io.StringIO(newline='')
+        self.batch.to_csv(output, 'phones')
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(rows[0], ['domain_name', 'call_hours',
+                                   'description', 'phone_number'])
+        self.assertEqual(rows[2], ['youtube.com', '10:00-19:00', '',
+                                   '650-253-0002'])
+        self.assertEqual(len(rows), 3)
+
+        with self.assertRaises(ValueError):
+            self.batch.to_csv(output, 'addresses')
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_arrow(self):
+        table = self.batch.to_arrow()
+        self.assertEqual(table.num_rows, 2)
+        rows = table.to_pylist()
+        self.assertEqual(rows[0]['emails'][1],
+                         {'description': 'Support',
+                          'email': 'support@google.com'})
+        self.assertEqual(rows[1]['phones'], [])
+        self.assertEqual(rows[0]['company_names'],
+                         self.payload['companyNames'])
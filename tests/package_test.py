@@ -0,0 +1,32 @@
+import subprocess
+import sys
+import unittest
+
+import websitecontacts
+
+
+class TestPackage(unittest.TestCase):
+    def test_exports(self):
+        for name in websitecontacts.__all__:
+            self.assertIsNotNone(getattr(websitecontacts, name), name)
+        self.assertTrue(set(websitecontacts.__all__) <= set(dir(websitecontacts)))
+        with self.assertRaises(AttributeError):
+            websitecontacts.NoSuchName
+
+    def test_lazy_import(self):
+        statement = (
+            'import sys, websitecontacts\n'
+            'from websitecontacts import Client, ResponseBatch\n'
+            'from websitecontacts.cache import MemoryCache\n'
+            'assert "requests" not in sys.modules\n'
+            'Client("at_" + "0" * 29, cache=MemoryCache())\n'
+            'print(sorted(m for m in ("requests", "aiohttp", "pyarrow",'
+            ' "asyncio", "sqlite3") if m in sys.modules))')
+        output = subprocess.run(
+            [sys.executable, '-c', statement], stdout=subprocess.PIPE,
+            universal_newlines=True, check=True).stdout
+        self.assertEqual(output.strip(), "['requests']")
+
+
+if __name__ == '__main__':
+    unittest.main()
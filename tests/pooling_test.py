@@ -0,0 +1,75 @@
+import time
+import unittest
+
+from websitecontacts import ApiRequester, Client, Response
+from tests.stub import API_KEY, StubServer
+
+
+class TestPooling(unittest.TestCase):
+    """
+    Connection reuse against a local stub server.
+    """
+    def setUp(self) -> None:
+        self.server = StubServer().start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _client(self, **kwargs) -> Client:
+        return Client(API_KEY, base_url=self.server.url, **kwargs)
+
+    def test_reuses_connection(self):
+        client = self._client(pooled=True)
+        for _ in range(5):
+            self.assertIsInstance(client.get('youtube.com'), Response)
+        self.assertEqual(1, self.server.connections)
+        client.close()
+
+    def test_not_pooled(self):
+        client = self._client()
+        for _ in range(3):
+            client.get('youtube.com')
+        self.assertEqual(3, self.server.connections)
+        self.assertIsNone(client.api_requester._session)
+
+    def test_close(self):
+        client = self._client(pooled=True)
+        client.get('youtube.com')
+        client.close()
+        self.assertIsNone(client.api_requester._session)
+        client.get('youtube.com')
+        self.assertEqual(2, self.server.connections)
+        client.close()
+
+    def test_idle_eviction(self):
+        client = self._client(pooled=True, pool_idle_timeout=0.1)
+        client.get('youtube.com')
+        session = client.api_requester._session
+        client.get('youtube.com')
+        self.assertIs(session, client.api_requester._session)
+
+        time.sleep(0.2)
+        client.get('youtube.com')
+        self.assertIsNot(session, client.api_requester._session)
+        self.assertEqual(2, self.server.connections)
+        client.close()
+
+    def test_turning_pooling_off(self):
+        client = self._client(pooled=True)
+        client.get('youtube.com')
+        client.api_requester.pooled = False
+        self.assertIsNone(client.api_requester._session)
+        client.get('youtube.com')
+        self.assertEqual(2, self.server.connections)
+
+    def test_invalid_parameters(self):
+        for value in (0, 1001, 5.0, '5', None):
+            with self.assertRaises(ValueError):
+                ApiRequester(pool_size=value)
+        for value in (0, -1, None):
+            with self.assertRaises(ValueError):
+                ApiRequester(pool_idle_timeout=value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import threading
+import time
+import unittest
+
+from websitecontacts import Client, RefreshScheduler
+from websitecontacts.cache import MemoryCache
+from tests.stub import API_KEY, StubServer
+
+
+def wait_until(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('Timed out')
+        time.sleep(0.01)
+
+
+class TestRefreshScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler = RefreshScheduler(workers=1, max_queue=3)
+        self.gate = threading.Event()
+        self.ran = []
+        # Keeps the only worker busy while the queue is filled.
+        self.scheduler.schedule('blocker', self.gate.wait)
+        wait_until(lambda: self.scheduler.running == 1)
+
+    def tearDown(self) -> None:
+        self.gate.set()
+        self.scheduler.close(wait=True)
+
+    def job(self, name):
+        return lambda: self.ran.append(name)
+
+    def test_priority(self):
+        self.scheduler.schedule('low', self.job('low'), 1)
+        self.scheduler.schedule('high', self.job('high'), 5)
+        self.scheduler.schedule('mid', self.job('mid'), 3)
+        self.assertEqual(3, self.scheduler.queue_depth)
+        self.gate.set()
+        wait_until(lambda: len(self.ran) == 3)
+        self.assertListEqual(['high', 'mid', 'low'], self.ran)
+
+    def test_deduplication(self):
+        self.assertTrue(self.scheduler.schedule('a', self.job('a'), 1))
+        self.assertTrue(self.scheduler.schedule('b', self.job('b'), 2))
+        self.assertFalse(self.scheduler.schedule('a', self.job('a2'), 3))
+        self.assertFalse(self.scheduler.schedule('blocker', self.job('x')))
+        self.assertEqual(2, self.scheduler.queue_depth)
+        self.gate.set()
+        wait_until(lambda: len(self.ran) == 2)
+        # The duplicate moved the queued job up but didn't run twice.
+        self.assertListEqual(['a2', 'b'], self.ran)
+        self.assertEqual(2, self.scheduler.stats()['deduplicated'])
+
+    def test_bounded_queue(self):
+        for name in 'abc':
+            self.assertTrue(self.scheduler.schedule(name, self.job(name)))
+        self.assertFalse(self.scheduler.schedule('d', self.job('d')))
+        self.gate.set()
+        wait_until(lambda: self.scheduler.stats()['completed'] == 4)
+        stats = self.scheduler.stats()
+        self.assertEqual(0, stats['queue_depth'])
+        self.assertEqual(4, stats['scheduled'])
+        self.assertEqual(1, stats['dropped'])
+
+    def test_failures(self):
+        self.scheduler.schedule('fail', lambda: 1 / 0)
+        self.gate.set()
+        wait_until(lambda: self.scheduler.stats()['completed'] == 2)
+        self.assertEqual(1, self.scheduler.stats()['failed'])
+
+    def test_close(self):
+        self.scheduler.schedule('a', self.job('a'))
+        self.scheduler.close()
+        self.assertEqual(0, self.scheduler.queue_depth)
+        self.assertFalse(self.scheduler.schedule('b', self.job('b')))
+        self.gate.set()
+        self.scheduler.close(wait=True)
+        self.assertListEqual([], self.ran)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RefreshScheduler(workers=0)
+        with self.assertRaises(ValueError):
+            RefreshScheduler(max_queue=0)
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = StubServer().start()
+        self.client = Client(API_KEY, base_url=self.server.url,
+                             cache=MemoryCache(), soft_ttl=0.05)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_background_refresh(self):
+        first = self.client.get('example.com')
+        self.assertEqual(0, len(first.emails))
+
+        # Fresh entries are served without a refresh.
+        self.assertIs(first, self.client.get('example.com'))
+        self.assertEqual(0, self.client.refresher.stats()['scheduled'])
+
+        time.sleep(0.1)
+        self.server.emails = 1
+        self.server.delay = 0.2
+        started = time.perf_counter()
+        self.assertIs(first, self.client.get('example.com'))
+        self.assertIs(first, self.client.get('example.com'))
+        self.assertLess(time.perf_counter() - started, 0.2)
+
+        wait_until(lambda: self.client.refresher.stats()['completed'] == 1)
+        self.assertEqual(1, len(self.client.get('example.com').emails))
+        self.assertListEqual(['example.com'] * 2, self.server.requests)
+        self.assertEqual(1, self.client.refresher.stats()['deduplicated'])
+
+    def test_expired_entry(self):
+        client = Client(API_KEY, base_url=self.server.url,
+                        cache=MemoryCache(ttl=0.05), soft_ttl=0.01,
+                        coalesce=False)
+        client.get('example.com')
+        time.sleep(0.1)
+        self.server.emails = 1
+        self.server.delay = 0
+        # Past the cache TTL the lookup waits for the API.
+        self.assertEqual(1, len(client.get('example.com').emails))
+        client.close()
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Client(API_KEY, cache=MemoryCache(), soft_ttl=0)
+        with self.assertRaises(ValueError):
+            Client(API_KEY, soft_ttl=60)
+        self.assertIsNone(Client(API_KEY).refresher)
@@ -0,0 +1,104 @@
+import time
+import unittest
+from unittest import mock
+
+from requests.exceptions import ConnectionError, Timeout
+
+from websitecontacts import Client, RetryPolicy, Response
+from websitecontacts import ApiAuthError, HttpApiError
+from tests.stub import API_KEY, StubServer
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff=0.5, max_backoff=2, jitter=False)
+        self.assertEqual(policy.delay(1), 0.5)
+        self.assertEqual(policy.delay(2), 1.0)
+        self.assertEqual(policy.delay(5), 2)
+        self.assertLessEqual(RetryPolicy(backoff=1).delay(1), 1)
+
+    def test_retry_after(self):
+        policy = RetryPolicy(jitter=False)
+        self.assertEqual(policy.delay(1, '7'), 7)
+        self.assertEqual(
+            policy.delay(1, 'Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+        self.assertEqual(policy.delay(1, 'soon'), 0.5)
+        self.assertEqual(
+            policy.delay(1, 'Wed, 21 Oct 2015 07:28:00 -0000'), 0)
+        self.assertEqual(policy.delay(1, '3600'), 30)
+
+    def test_auth_errors_not_retryable(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(retry_statuses=[403, 503])
+
+
+class TestRetry(unittest.TestCase):
+    """
+    Retries against a local stub server.
+    """
+    def setUp(self) -> None:
+        self.server = StubServer().start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _client(self, policy: RetryPolicy) -> Client:
+        return Client(API_KEY, base_url=self.server.url, retry=policy)
+
+    def test_retries_until_success(self):
+        self.server.failures['flaky.com'] = 2
+        client = self._client(RetryPolicy(max_attempts=3))
+        self.assertIsInstance(client.get('flaky.com'), Response)
+        self.assertEqual(self.server.requests, ['flaky.com'] * 3)
+
+    def test_gives_up_after_max_attempts(self):
+        self.server.failures['flaky.com'] = 5
+        client = self._client(RetryPolicy(max_attempts=2))
+        with self.assertRaises(HttpApiError):
+            client.get('flaky.com')
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_auth_error_not_retried(self):
+        client = self._client(RetryPolicy(max_attempts=5))
+        with self.assertRaises(ApiAuthError):
+            client.get('denied.com')
+        self.assertEqual(self.server.requests, ['denied.com'])
+
+    def test_deadline(self):
+        self.server.failures['flaky.com'] = 5
+        self.server.delay = 0.2
+        client = self._client(RetryPolicy(max_attempts=10, deadline=0.5))
+        started = time.monotonic()
+        with self.assertRaises((HttpApiError, Timeout)):
+            client.get('flaky.com')
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertLess(len(self.server.requests), 4)
+
+    @staticmethod
+    def _oversleeping():
+        # Only the requester's sleeps overshoot, not the stub server's.
+        clock = mock.Mock(wraps=time)
+        clock.sleep = lambda delay: time.sleep(delay + 0.5)
+        return mock.patch('websitecontacts.net.http.time', clock)
+
+    def test_sleep_past_deadline(self):
+        self.server.failures['flaky.com'] = 5
+        client = self._client(RetryPolicy(max_attempts=5, deadline=0.3))
+        # Retry-After fits before the deadline but sleeping overshoots it.
+        with self._oversleeping():
+            with self.assertRaises(HttpApiError):
+                client.get('flaky.com')
+        self.assertEqual(self.server.requests, ['flaky.com'])
+
+    def test_connection_error_past_deadline(self):
+        client = Client(API_KEY, base_url='http://localhost:1/api/v1',
+                        retry=RetryPolicy(max_attempts=5, backoff=0.1,
+                                          deadline=0.3))
+        with self._oversleeping():
+            with self.assertRaises(ConnectionError):
+                client.get('flaky.com')
+
+
+if __name__ == '__main__':
+    unittest.main()
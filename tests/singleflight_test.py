@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import unittest
+
+from websitecontacts.singleflight import AsyncSingleFlight, SingleFlight
+from tests.stub import run_async
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_do_many(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            started.set()
+            release.wait()
+            return 'a'
+
+        def func(keys):
+            calls.append(keys)
+            return {key: key.upper() for key in keys if key != 'c'}
+
+        leader = threading.Thread(target=flight.do, args=('a', slow))
+        leader.start()
+        started.wait()
+        results = {}
+        batch = threading.Thread(target=lambda: results.update(
+            flight.do_many(['a', 'b', 'c', 'b'], func)))
+        batch.start()
+        batch.join(0.05)
+        # Waits for the call fetching 'a', the others are sent.
+        self.assertTrue(batch.is_alive())
+        release.set()
+        batch.join()
+        leader.join()
+        self.assertListEqual([['b', 'c']], calls)
+        self.assertDictEqual({'a': 'a', 'b': 'B', 'c': None}, results)
+        self.assertEqual(1, flight.collapsed)
+
+    def test_do_many_errors(self):
+        flight = SingleFlight()
+        error = ValueError('b')
+        self.assertDictEqual(
+            {'a': 'A', 'b': error},
+            flight.do_many(['a', 'b'], lambda keys: {'a': 'A', 'b': error}))
+
+        def fail(keys):
+            raise error
+
+        self.assertDictEqual({'a': error}, flight.do_many(['a'], fail))
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+
+    def test_collapses_calls(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'result'
+
+        async def run():
+            return await asyncio.gather(
+                *[flight.do('key', func) for _ in range(3)])
+
+        self.assertListEqual(['result'] * 3, run_async(run()))
+        self.assertEqual(1, len(calls))
+        self.assertEqual(2, flight.collapsed)
+
+    def test_leader_cancelled(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'result'
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do('key', func))
+            await asyncio.sleep(0)
+            followers = [asyncio.ensure_future(flight.do('key', func))
+                         for _ in range(2)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results = await asyncio.gather(*followers)
+            return leader.cancelled(), results
+
+        cancelled, results = run_async(run())
+        self.assertTrue(cancelled)
+        # The followers got a result from a new call, not the cancellation.
+        self.assertListEqual(['result'] * 2, results)
+        self.assertEqual(2, len(calls))
+        self.assertEqual(1, flight.collapsed)
+
+    def test_follower_cancelled(self):
+        flight = AsyncSingleFlight()
+
+        async def func():
+            await asyncio.sleep(0.05)
+            return 'result'
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do('key', func))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do('key', func))
+            await asyncio.sleep(0.01)
+            follower.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await follower
+            return await leader
+
+        self.assertEqual('result', run_async(run()))
+
+
+if __name__ == '__main__':
+    unittest.main()
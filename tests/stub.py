@@ -0,0 +1,232 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlparse, parse_qs
+
+API_KEY = 'at_' + '0' * 29
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    # http.server.ThreadingHTTPServer needs Python 3.7.
+    daemon_threads = True
+
+
+def run_async(coroutine):
+    """asyncio.run(), which needs Python 3.7."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Minimal stand-in for the Website Contacts API.
+
+    `denied.com` and API keys listed in the server's `revoked_keys` get
+    a 403 answer, a domain listed in the server's `failures` gets a 503
+    answer until its counter runs out, every other domain gets a small
+    successful response with the server's `emails` count of emails.
+    Served domains and API keys are recorded on the server and every
+    answer is delayed by the server's `delay` seconds. A domain listed
+    in the server's `stalls` is answered after 5 more seconds until its
+    counter runs out.
+
+    POST requests follow the batch contract: `{"domainNames": [...]}` is
+    answered with `{"results": [...]}`, one result per domain, with an
+    error object for `denied.com` and no result for `missing.com`. Each
+    batch is recorded in the server's `batches`.
+
+    Successful answers carry an ETag and get a 304 answer when it is sent
+    back in If-None-Match. With the server's `compress` flag, answers are
+    gzip-compressed for clients accepting it. The number of body bytes
+    sent is kept in the server's `bytes_sent`, and the number of accepted
+    connections in its `connections`.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        domain = query['domainName'][0]
+        api_key = query['apiKey'][0]
+        with self.server.lock:
+            self.server.requests.append(domain)
+            self.server.api_keys.append(api_key)
+            failing = self.server.failures.get(domain, 0)
+            if failing:
+                self.server.failures[domain] = failing - 1
+            stalling = self.server.stalls.get(domain, 0)
+            if stalling:
+                self.server.stalls[domain] = stalling - 1
+        time.sleep(self.server.delay + (5 if stalling else 0))
+        if failing:
+            self.send_json(503, {'code': 503, 'messages': 'Unavailable'},
+                           {'Retry-After': '0'})
+        elif domain == 'denied.com' or api_key in self.server.revoked_keys:
+            self.send_json(403, {'code': 403, 'messages': 'Access restricted'})
+        elif query.get('outputFormat') == ['xml']:
+            self.send_body(200, (
+                '<?xml version="1.0" encoding="utf-8"?><websiteContacts>'
+                '<domainName>{}</domainName><meta/><socialLinks/>'
+                '<websiteResponded>true</websiteResponded>'
+                '</websiteContacts>').format(domain).encode('utf-8'),
+                'application/xml')
+        else:
+            body = {'domainName': domain, 'meta': {}, 'socialLinks': {},
+                    'websiteResponded': True}
+            if self.server.emails:
+                body['emails'] = [
+                    {'description': 'Sales', 'email': 'sales{}@{}'.format(
+                        i, domain)} for i in range(self.server.emails)]
+            payload = json.dumps(body).encode('utf-8')
+            etag = '"{}"'.format(hashlib.md5(payload).hexdigest())
+            if self.headers.get('If-None-Match') == etag:
+                self.send_body(304, b'', 'application/json', {'ETag': etag})
+            else:
+                self.send_body(200, payload, 'application/json',
+                               {'ETag': etag})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        api_key = self.headers.get('X-Authentication-Token')
+        with self.server.lock:
+            self.server.batches.append(body['domainNames'])
+            self.server.api_keys.append(api_key)
+        time.sleep(self.server.delay)
+        if api_key in self.server.revoked_keys:
+            self.send_json(403, {'code': 403, 'messages': 'Access restricted'})
+            return
+
+        results = []
+        for domain in body['domainNames']:
+            if domain == 'denied.com':
+                results.append({'domainName': domain, 'code': 403,
+                                'messages': 'Access restricted'})
+            elif domain != 'missing.com':
+                results.append({'domainName': domain, 'meta': {},
+                                'socialLinks': {}, 'websiteResponded': True})
+        self.send_json(200, {'results': results})
+
+    def send_json(self, status: int, body, headers=None):
+        self.send_body(status, json.dumps(body).encode('utf-8'),
+                       'application/json', headers)
+
+    def send_body(self, status: int, payload: bytes, content_type: str,
+                  headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if payload and self.server.compress and 'gzip' in self.headers.get(
+                'Accept-Encoding', ''):
+            payload = gzip.compress(payload)
+            self.send_header('Content-Encoding', 'gzip')
+        with self.server.lock:
+            self.server.bytes_sent += len(payload)
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class StubServer:
+    def __init__(self, handler=StubHandler, delay: float = 0):
+        self._server = ThreadingHTTPServer(('localhost', 0), handler)
+        self._server.daemon_threads = True
+        self._server.delay = delay
+        self._server.lock = threading.Lock()
+        self._server.requests = []
+        self._server.failures = {}
+        self._server.stalls = {}
+        self._server.api_keys = []
+        self._server.batches = []
+        self._server.revoked_keys = set()
+        self._server.emails = 0
+        self._server.compress = False
+        self._server.bytes_sent = 0
+        self._server.connections = 0
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return 'http://localhost:{}/api/v1'.format(
+            self._server.server_address[1])
+
+    @property
+    def requests(self) -> list:
+        return self._server.requests
+
+    @property
+    def batches(self) -> list:
+        return self._server.batches
+
+    @property
+    def api_keys(self) -> list:
+        return self._server.api_keys
+
+    @property
+    def revoked_keys(self) -> set:
+        return self._server.revoked_keys
+
+    @property
+    def emails(self) -> int:
+        return self._server.emails
+
+    @emails.setter
+    def emails(self, value: int):
+        self._server.emails = value
+
+    @property
+    def compress(self) -> bool:
+        return self._server.compress
+
+    @compress.setter
+    def compress(self, value: bool):
+        self._server.compress = value
+
+    @property
+    def bytes_sent(self) -> int:
+        return self._server.bytes_sent
+
+    @property
+    def connections(self) -> int:
+        return self._server.connections
+
+    @property
+    def delay(self) -> float:
+        return self._server.delay
+
+    @delay.setter
+    def delay(self, value: float):
+        self._server.delay = value
+
+    @property
+    def failures(self) -> dict:
+        return self._server.failures
+
+    @property
+    def stalls(self) -> dict:
+        return self._server.stalls
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,94 @@
+import threading
+import time
+import unittest
+
+from websitecontacts.net.throttle import TokenBucket, ConcurrencyLimiter
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=20, burst=5)
+        started = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - started, 0.05)
+        for _ in range(4):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+    def test_shared_between_threads(self):
+        bucket = TokenBucket(rate=50, burst=1)
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(10)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - started, 0.17)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+
+    def test_fixed_limit(self):
+        limiter = ConcurrencyLimiter(2)
+        limiter.acquire()
+        limiter.acquire()
+        blocked = threading.Thread(target=limiter.acquire)
+        blocked.start()
+        blocked.join(0.05)
+        self.assertTrue(blocked.is_alive())
+        limiter.release(0.01, 503)
+        blocked.join(1)
+        self.assertFalse(blocked.is_alive())
+        self.assertEqual(limiter.limit, 2)
+
+    def test_aimd(self):
+        limiter = ConcurrencyLimiter(8, adaptive=True)
+        limiter.acquire()
+        limiter.release(0.1, 429)
+        self.assertEqual(limiter.limit, 4)
+        limiter.acquire()
+        limiter.release(0.1, None)
+        self.assertEqual(limiter.limit, 2)
+
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release(0.1, 200)
+        self.assertGreater(limiter.limit, 2)
+
+        limiter.acquire()
+        limiter.release(1.0, 200)
+        self.assertLessEqual(limiter.limit, 3)
+
+    def test_burst_of_failures(self):
+        limiter = ConcurrencyLimiter(32, adaptive=True)
+        barrier = threading.Barrier(16)
+
+        def fail():
+            generation = limiter.acquire()
+            barrier.wait()
+            limiter.release(0.1, 503, generation=generation)
+
+        threads = [threading.Thread(target=fail) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # The requests were all in flight: one decrease, not sixteen.
+        self.assertEqual(16, limiter.limit)
+        self.assertEqual(0, limiter.in_flight)
+
+        generation = limiter.acquire()
+        limiter.release(0.1, 503, generation=generation)
+        self.assertEqual(8, limiter.limit)
+
+
+if __name__ == '__main__':
+    unittest.main()